@@ -1,9 +1,12 @@
 """FastAPI application -- entry point for the admin API."""
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from admin_api.deps import close_pool
 from admin_api.routes import (
     agent,
     config,
@@ -14,10 +17,18 @@ from admin_api.routes import (
     users,
 )
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await close_pool()
+
+
 app = FastAPI(
     title="Wellness Admin API",
     version="0.1.0",
     description="Backend API for the Vasini Wellness admin dashboard.",
+    lifespan=lifespan,
 )
 
 # CORS -- allow the local dev frontends
@@ -1,4 +1,4 @@
-"""Shared dependencies -- database connection and paths."""
+"""Shared dependencies -- database connection pool and paths."""
 from __future__ import annotations
 
 import os
@@ -9,12 +9,49 @@ import aiosqlite
 DB_PATH = os.getenv("DB_PATH", "../../packages/telegram-bot/data/wellness.db")
 PACK_DIR = Path(os.getenv("PACK_DIR", "../../packs/wellness-cbt"))
 ENV_PATH = Path(os.getenv("ENV_PATH", "../../packages/telegram-bot/.env"))
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
 
+# Per-connection settings, applied once when a pooled connection is opened.
+# journal_mode is a property of the database file and is left to the bot.
+_CONNECTION_PRAGMAS = """
+PRAGMA busy_timeout=30000;
+PRAGMA temp_store=MEMORY;
+PRAGMA mmap_size=268435456;
+PRAGMA cache_size=-16384;
+"""
 
-async def get_db():
-    """Yield an aiosqlite connection, closing it after the request."""
+# Idle connections, reused LIFO so the most recently warmed page cache goes out first
+_idle: list[aiosqlite.Connection] = []
+
+
+async def _open() -> aiosqlite.Connection:
     db = await aiosqlite.connect(DB_PATH)
+    await db.executescript(_CONNECTION_PRAGMAS)
+    return db
+
+
+async def get_db():
+    """Yield a pooled aiosqlite connection, returning it to the pool after the request.
+
+    Up to POOL_SIZE connections are kept open; requests beyond that get a
+    temporary connection that is closed afterwards.
+    """
+    db = _idle.pop() if _idle else await _open()
     try:
         yield db
-    finally:
+    except BaseException:
+        # Unknown state after a failed request; don't hand it to the next one
+        await db.close()
+        raise
+    if db.in_transaction:
+        await db.rollback()
+    if len(_idle) < POOL_SIZE:
+        _idle.append(db)
+    else:
         await db.close()
+
+
+async def close_pool() -> None:
+    """Close every idle pooled connection (called on application shutdown)."""
+    while _idle:
+        await _idle.pop().close()
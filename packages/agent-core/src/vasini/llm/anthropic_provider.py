@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import asyncio
+
 import httpx
 
 from vasini.llm.providers import LLMResponse, Message
@@ -17,10 +19,13 @@ class AnthropicProvider:
         api_key: str,
         default_model: str = "claude-sonnet-4-5-20250929",
         max_tokens: int = 4096,
+        max_concurrency: int = 32,
     ) -> None:
         self.api_key = api_key
         self.default_model = default_model
         self.max_tokens = max_tokens
+        # Caps in-flight requests so bursts queue locally instead of hitting rate limits
+        self._semaphore = asyncio.Semaphore(max_concurrency)
         self._client = httpx.AsyncClient(
             headers={
                 "x-api-key": api_key,
@@ -64,10 +69,14 @@ class AnthropicProvider:
     async def chat(
         self,
         messages: list[Message],
-        system: str | None = None,
+        system: str | list[dict] | None = None,
         model: str | None = None,
     ) -> LLMResponse:
-        """Send messages to Claude and return response."""
+        """Send messages to Claude and return response.
+
+        *system* may be a plain string or a list of content blocks (e.g. with
+        ``cache_control`` for prompt caching); it is forwarded as-is.
+        """
         system_text = system or self._extract_system(messages)
         formatted = self._format_messages(messages)
 
@@ -79,7 +88,8 @@ class AnthropicProvider:
         if system_text:
             body["system"] = system_text
 
-        resp = await self._client.post(self.API_URL, json=body)
+        async with self._semaphore:
+            resp = await self._client.post(self.API_URL, json=body)
         resp.raise_for_status()
         return self._parse_response(resp.json())
 
@@ -1,5 +1,8 @@
 """Tests for Anthropic Claude provider."""
 
+import asyncio
+from unittest.mock import MagicMock
+
 import pytest
 
 from vasini.llm.anthropic_provider import AnthropicProvider
@@ -78,3 +81,26 @@ class TestAnthropicProvider:
         }
         response = provider._parse_response(raw)
         assert response.content == "Hello world!"
+
+    async def test_chat_caps_concurrent_requests(self):
+        provider = AnthropicProvider(api_key="test-key", max_concurrency=2)
+        in_flight = 0
+        peak = 0
+
+        async def fake_post(url, json):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            resp = MagicMock()
+            resp.json.return_value = {"content": [{"type": "text", "text": "ok"}]}
+            return resp
+
+        provider._client.post = fake_post
+        messages = [Message(role="user", content="Hello")]
+        results = await asyncio.gather(*(provider.chat(messages) for _ in range(5)))
+
+        assert [r.content for r in results] == ["ok"] * 5
+        assert peak == 2
+        await provider.close()
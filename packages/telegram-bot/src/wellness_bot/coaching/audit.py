@@ -53,9 +53,9 @@ class AuditLogger:
         action: str,
         message_hash: str | None = None,
     ) -> None:
-        """Insert a safety event into *safety_events*."""
+        """Insert a safety event into *coaching_safety_events*."""
         await self._db.execute(
-            "INSERT INTO safety_events "
+            "INSERT INTO coaching_safety_events "
             "(session_id, detector, severity, action, message_hash) "
             "VALUES (?, ?, ?, ?, ?)",
             (session_id, detector, severity, action, message_hash),
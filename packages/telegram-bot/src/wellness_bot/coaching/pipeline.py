@@ -38,7 +38,7 @@ logger = logging.getLogger(__name__)
 # Crisis response templates by language
 # ---------------------------------------------------------------------------
 
-_CRISIS_RESPONSES = {
+CRISIS_RESPONSES = {
     "ru": (
         "Я слышу тебя. То, что ты чувствуешь — серьёзно, и ты заслуживаешь "
         "помощи прямо сейчас.\n\n"
@@ -68,7 +68,7 @@ _CRISIS_RESPONSES = {
 # Safe fallback responses by language
 # ---------------------------------------------------------------------------
 
-_SAFE_FALLBACKS = {
+SAFE_FALLBACKS = {
     "ru": "Я здесь и слушаю. Расскажи, что тебя беспокоит?",
     "en": "I'm here and listening. Tell me what's on your mind?",
     "es": "Estoy aquí y escucho. Cuéntame qué te preocupa.",
@@ -165,7 +165,7 @@ class CoachingPipeline:
         if safety_result.risk_level == "crisis":
             fsm.enter_crisis()
             language = self._language_resolver.resolve(user_id, text)
-            response = _CRISIS_RESPONSES.get(language, _CRISIS_RESPONSES["en"])
+            response = CRISIS_RESPONSES.get(language, CRISIS_RESPONSES["en"])
             logger.info(
                 "AUDIT | user=%s step=safety_gate result=crisis signals=%s",
                 user_id,
@@ -377,4 +377,4 @@ class CoachingPipeline:
         str
             A safe, generic response in the appropriate language.
         """
-        return _SAFE_FALLBACKS.get(language, _SAFE_FALLBACKS["en"])
+        return SAFE_FALLBACKS.get(language, SAFE_FALLBACKS["en"])
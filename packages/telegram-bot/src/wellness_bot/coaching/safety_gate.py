@@ -10,8 +10,10 @@ from __future__ import annotations
 import re
 from dataclasses import dataclass, field
 
+from wellness_bot.text_cache import cached_short
 
-@dataclass
+
+@dataclass(slots=True)
 class SafetyGateResult:
     """Result of a safety gate check."""
 
@@ -59,6 +61,15 @@ _p(
 )
 
 
+def _scan(text: str) -> tuple[tuple[str, ...], frozenset[str]]:
+    """Signals (in pattern order) and risk levels of every pattern found in text."""
+    hits = [(signal, level) for pattern, signal, level in _PATTERNS if pattern.search(text)]
+    return tuple(signal for signal, _ in hits), frozenset(level for _, level in hits)
+
+
+_scan_cached = cached_short(_scan)
+
+
 class SafetyGate:
     """Deterministic multilingual crisis detector.
 
@@ -79,26 +90,20 @@ class SafetyGate:
         if not text or not text.strip():
             return SafetyGateResult(risk_level="safe", safety_action="pass")
 
-        signals: list[str] = []
-        levels: set[str] = set()
-
-        for pattern, signal, level in _PATTERNS:
-            if pattern.search(text):
-                signals.append(signal)
-                levels.add(level)
+        found, levels = _scan_cached(text)
 
         if "crisis" in levels:
             return SafetyGateResult(
                 risk_level="crisis",
                 safety_action="crisis_protocol",
-                signals=signals,
+                signals=list(found),
             )
 
         if "high" in levels:
             return SafetyGateResult(
                 risk_level="high",
                 safety_action="flag_review",
-                signals=signals,
+                signals=list(found),
             )
 
         return SafetyGateResult(risk_level="safe", safety_action="pass")
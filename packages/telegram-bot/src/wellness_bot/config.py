@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from pydantic import field_validator
 from pydantic_settings import BaseSettings
 
 
@@ -14,6 +15,7 @@ class BotConfig(BaseSettings):
     # Anthropic
     anthropic_api_key: str
     claude_model: str = "claude-sonnet-4-5-20250929"
+    llm_concurrency: int = 32  # max in-flight LLM requests
 
     # OpenAI (Whisper STT)
     openai_api_key: str
@@ -31,12 +33,24 @@ class BotConfig(BaseSettings):
     # Paths
     pack_dir: str = "packs/wellness-cbt"
     db_path: str = "data/wellness.db"
+    # SessionStore shard count. Only 1 is accepted until the admin API can read
+    # sharded files; once data exists the count is fixed (users map by user_id % N,
+    # and there is no re-sharding migration)
+    db_shards: int = 1
+    tts_cache_dir: str = "data/tts_cache"
 
     # Allowed users (telegram user IDs, comma-separated)
     allowed_user_ids: str = ""
 
     model_config = {"env_file": ".env", "env_file_encoding": "utf-8", "extra": "ignore"}
 
+    @field_validator("db_shards")
+    @classmethod
+    def _single_shard_only(cls, v: int) -> int:
+        if v != 1:
+            raise ValueError("db_shards must be 1: the admin API reads only db_path")
+        return v
+
     @property
     def allowed_ids(self) -> set[int]:
         if not self.allowed_user_ids:
@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
-import io
+import asyncio
+import hashlib
 import logging
+from dataclasses import dataclass
 from pathlib import Path
 
 from aiogram import Bot, F, Router
@@ -16,14 +18,42 @@ from vasini.llm.providers import Message
 from vasini.llm.router import LLMRouter, LLMRouterConfig, ModelTier
 from vasini.runtime.agent import AgentRuntime
 
-from wellness_bot.coaching.pipeline import CoachingPipeline, PipelineConfig
+from wellness_bot.coaching.pipeline import (
+    CRISIS_RESPONSES,
+    SAFE_FALLBACKS,
+    CoachingPipeline,
+    PipelineConfig,
+)
 from wellness_bot.config import BotConfig
+from wellness_bot.fs import atomic_write
 from wellness_bot.session_store import SessionStore
 from wellness_bot.voice import VoicePipeline
 
 logger = logging.getLogger(__name__)
 router = Router()
 
+WELCOME_TEXT = (
+    "Привет! Я — wellness-ассистент, работаю на основе когнитивно-поведенческой "
+    "терапии и метакогниции.\n\n"
+    "Я не врач и не заменяю терапевта. Но могу помочь разобраться в мыслях, "
+    "эмоциях и научить конкретным техникам.\n\n"
+    "Можешь писать текстом или голосовыми — я отвечу так же.\n\n"
+    "Как ты себя сейчас чувствуешь? Оцени от 1 до 10."
+)
+
+# Deterministic voice replies whose synthesized audio is cached on disk and reused
+_CANNED_REPLIES = frozenset({*CRISIS_RESPONSES.values(), *SAFE_FALLBACKS.values()})
+
+
+@dataclass(slots=True, frozen=True)
+class _Services:
+    """Subsystems built by ``WellnessBot.setup()``; fixed for the process lifetime."""
+
+    store: SessionStore
+    provider: AnthropicProvider
+    runtime: AgentRuntime
+    voice: VoicePipeline
+
 
 class WellnessBot:
     """Central bot controller wiring all components."""
@@ -35,11 +65,12 @@ class WellnessBot:
         self.agent_runtime: AgentRuntime | None = None
         self.provider: AnthropicProvider | None = None
         self.pipeline: CoachingPipeline | None = None
+        self._svc: _Services | None = None
 
     async def setup(self) -> None:
         """Initialize all subsystems."""
         # Session store
-        self.store = SessionStore(self.config.db_path)
+        self.store = SessionStore(self.config.db_path, shards=self.config.db_shards)
         await self.store.init()
 
         # Voice pipeline
@@ -54,6 +85,7 @@ class WellnessBot:
         self.provider = AnthropicProvider(
             api_key=self.config.anthropic_api_key,
             default_model=self.config.claude_model,
+            max_concurrency=self.config.llm_concurrency,
         )
 
         # Load pack and build runtime
@@ -78,27 +110,59 @@ class WellnessBot:
             config=PipelineConfig(db_path=self.config.db_path),
         )
 
-    def _require_setup(self) -> tuple[SessionStore, AnthropicProvider, AgentRuntime, VoicePipeline]:
-        """Assert all subsystems are initialized and return them."""
-        assert self.store is not None, "Bot not initialized — call setup() first"
-        assert self.provider is not None, "Bot not initialized — call setup() first"
-        assert self.agent_runtime is not None, "Bot not initialized — call setup() first"
-        assert self.voice is not None, "Bot not initialized — call setup() first"
-        return self.store, self.provider, self.agent_runtime, self.voice
+        self._svc = _Services(self.store, self.provider, self.agent_runtime, self.voice)
+
+    def _require_setup(self) -> _Services:
+        """Return the initialized subsystems, raising if setup() has not run."""
+        svc = self._svc
+        if svc is None:
+            raise RuntimeError("Bot not initialized — call setup() first")
+        return svc
+
+    async def _tts_cached(self, text: str) -> bytes:
+        """Synthesize *text*, reusing audio written to the TTS cache by earlier calls."""
+        voice = self._require_setup().voice
+        key = hashlib.sha256(
+            f"{text}\0{voice.elevenlabs_voice_id}\0{voice.elevenlabs_model}".encode()
+        ).hexdigest()
+        path = Path(self.config.tts_cache_dir) / f"{key}.mp3"
+        # File I/O runs in a worker thread so a slow disk doesn't stall the event loop
+        try:
+            return await asyncio.to_thread(path.read_bytes)
+        except FileNotFoundError:
+            pass
+
+        audio = await voice.text_to_speech(text)
+
+        # Best-effort: a failed write only costs a re-synthesis next time
+        try:
+            await asyncio.to_thread(atomic_write, path, audio)
+        except OSError:
+            logger.warning("Could not write TTS cache entry %s", path, exc_info=True)
+        return audio
+
+    async def text_to_speech(self, text: str) -> bytes:
+        """Synthesize a reply, serving canned replies from the TTS cache."""
+        if text in _CANNED_REPLIES:
+            return await self._tts_cached(text)
+        return await self._require_setup().voice.text_to_speech(text)
 
     async def process_text(self, user_id: int, text: str) -> str:
         """Process a text message and return response."""
-        store, provider, runtime, _ = self._require_setup()
+        svc = self._require_setup()
+        store = svc.store
 
-        # Save user message
-        await store.save_message(user_id, "user", text)
+        # Load conversation history (without the current message, appended below)
+        history, moods = await asyncio.gather(
+            store.get_messages(user_id, limit=19),
+            store.get_moods(user_id, limit=5),
+        )
 
-        # Load conversation history
-        history = await store.get_messages(user_id, limit=20)
-        moods = await store.get_moods(user_id, limit=5)
+        # Save user message off the critical path; it overlaps the LLM call
+        save_user = asyncio.create_task(store.save_message(user_id, "user", text))
 
         # Build context for LLM
-        system_prompt = runtime._build_system_prompt()
+        system_prompt = svc.runtime._build_system_prompt()
 
         # Add mood context if available
         if moods:
@@ -109,26 +173,33 @@ class WellnessBot:
 
         # Build messages
         messages = [Message(role=m["role"], content=m["content"]) for m in history]
+        messages.append(Message(role="user", content=text))
 
         # Call Claude
-        response = await provider.chat(messages=messages, system=system_prompt)
+        try:
+            response = await svc.provider.chat(messages=messages, system=system_prompt)
+        except Exception:
+            await save_user
+            raise
         reply = response.content
 
-        # Track token usage
+        # Track token usage (queued; written in background batches)
         usage = response.usage
         if usage:
-            await store.save_token_usage(
+            store.log_token_usage(
                 user_id=user_id,
                 model=response.model,
                 input_tokens=usage.get("input_tokens", 0),
                 output_tokens=usage.get("output_tokens", 0),
             )
 
-        # Save assistant response
-        await store.save_message(user_id, "assistant", reply)
-
-        # Reset missed check-ins counter (user is active)
-        await store.reset_missed_checkins(user_id)
+        await asyncio.gather(
+            save_user,
+            # Save assistant response
+            store.save_message(user_id, "assistant", reply),
+            # Reset missed check-ins counter (user is active)
+            store.reset_missed_checkins(user_id),
+        )
 
         return reply
 
@@ -170,19 +241,11 @@ async def cmd_start(message: TgMessage) -> None:
     bot = get_bot()
     assert message.from_user is not None
     user_id = message.from_user.id
-    store, _, _, _ = bot._require_setup()
+    store = bot._require_setup().store
     await store.update_user_state(user_id, status="onboarding")
 
-    welcome = (
-        "Привет! Я — wellness-ассистент, работаю на основе когнитивно-поведенческой "
-        "терапии и метакогниции.\n\n"
-        "Я не врач и не заменяю терапевта. Но могу помочь разобраться в мыслях, "
-        "эмоциях и научить конкретным техникам.\n\n"
-        "Можешь писать текстом или голосовыми — я отвечу так же.\n\n"
-        "Как ты себя сейчас чувствуешь? Оцени от 1 до 10."
-    )
-    await message.answer(welcome)
-    await store.save_message(user_id, "assistant", welcome)
+    await message.answer(WELCOME_TEXT)
+    await store.save_message(user_id, "assistant", WELCOME_TEXT)
 
 
 @router.message(F.voice)
@@ -191,16 +254,16 @@ async def handle_voice(message: TgMessage, bot: Bot) -> None:
     wellness = get_bot()
     assert message.from_user is not None
     user_id = message.from_user.id
-    _, _, _, voice = wellness._require_setup()
+    voice = wellness._require_setup().voice
 
     try:
         # Download voice file
         assert message.voice is not None
         file = await bot.get_file(message.voice.file_id)
         assert file.file_path is not None
-        voice_data = io.BytesIO()
-        await bot.download_file(file.file_path, voice_data)
-        audio_bytes = voice_data.getvalue()
+        voice_data = await bot.download_file(file.file_path)
+        assert voice_data is not None
+        audio_bytes = voice_data.read()
 
         # STT
         text = await voice.speech_to_text(audio_bytes)
@@ -213,7 +276,7 @@ async def handle_voice(message: TgMessage, bot: Bot) -> None:
 
         # TTS — respond with voice
         try:
-            audio_reply = await voice.text_to_speech(reply)
+            audio_reply = await wellness.text_to_speech(reply)
             await message.answer_voice(voice=BufferedInputFile(audio_reply, filename="reply.mp3"))
         except Exception as e:
             logger.exception(f"TTS failed for {user_id}, falling back to text")
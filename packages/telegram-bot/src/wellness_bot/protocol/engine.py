@@ -27,6 +27,14 @@ _ALLOWED: dict[DialogueState, set[DialogueState]] = {
 # Re-entry: any state (except SESSION_END) can go to SAFETY_CHECK or SESSION_END
 _GLOBAL_TARGETS = {DialogueState.SAFETY_CHECK, DialogueState.SESSION_END}
 
+# Next state after a non-crisis safety check, by session type.
+# RETURNING and QUICK_CHECKIN fall through to FORMULATION.
+_NEXT_AFTER_SAFETY: dict[SessionType, DialogueState] = {
+    SessionType.NEW_USER: DialogueState.INTAKE,
+    SessionType.RETURNING_LONG_GAP: DialogueState.INTAKE,  # short re-intake
+    SessionType.RESUME: DialogueState.PRACTICE,
+}
+
 
 class ProtocolEngine:
     def is_transition_allowed(self, from_state: DialogueState, to_state: DialogueState) -> bool:
@@ -57,11 +65,4 @@ class ProtocolEngine:
     ) -> DialogueState:
         if risk_level == RiskLevel.CRISIS:
             return DialogueState.ESCALATION
-        if session_type == SessionType.NEW_USER:
-            return DialogueState.INTAKE
-        if session_type == SessionType.RETURNING_LONG_GAP:
-            return DialogueState.INTAKE  # short re-intake
-        if session_type == SessionType.RESUME:
-            return DialogueState.PRACTICE
-        # RETURNING, QUICK_CHECKIN
-        return DialogueState.FORMULATION
+        return _NEXT_AFTER_SAFETY.get(session_type, DialogueState.FORMULATION)
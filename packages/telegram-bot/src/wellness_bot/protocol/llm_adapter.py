@@ -1,9 +1,14 @@
 """LLM adapter with contract-bound generation and multi-layer validation."""
 from __future__ import annotations
 
+import asyncio
+import functools
+import hashlib
+import json
 import logging
 import re
 import time
+from collections import OrderedDict, deque
 from dataclasses import dataclass, field
 
 from wellness_bot.protocol.types import LLMContract, RiskLevel
@@ -98,6 +103,10 @@ RU-focused variant (if locale is ru):
 \u041f\u0440\u0438 \u0440\u0438\u0441\u043a\u0435 \u0431\u0435\u0437\u043e\u043f\u0430\u0441\u043d\u043e\u0441\u0442\u044c \u0432\u0430\u0436\u043d\u0435\u0435 \u0441\u0442\u0438\u043b\u044f.
 """
 
+# Static system block, marked for Anthropic prompt caching so repeat turns
+# reuse the prefilled prefix instead of re-billing it.
+_STYLE_BLOCK = {"type": "text", "text": STYLE_SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}
+
 # ---------------------------------------------------------------------------
 # State-specific fallback templates
 # ---------------------------------------------------------------------------
@@ -122,42 +131,81 @@ DEFAULT_FALLBACK = "\u041f\u043e\u043d\u0438\u043c\u0430\u044e. \u0414\u0430\u04
 # Diagnostic / medication / harmful lexicon patterns
 # ---------------------------------------------------------------------------
 
-_DIAGNOSIS_PATTERNS = [
-    re.compile(p, re.IGNORECASE)
-    for p in [
+
+def _union(patterns: list[str]) -> re.Pattern[str]:
+    """Compile *patterns* into one case-insensitive alternation (single scan per text)."""
+    return re.compile("|".join(f"(?:{p})" for p in patterns), re.IGNORECASE)
+
+
+_DIAGNOSIS_RE = _union(
+    [
         r"\b(у вас|у тебя)\s+(депресси|тревожн|биполяр|шизофрен|птср|окр|bpd|adhd|ocd)",
         r"\byou have\s+(depression|anxiety|bipolar|schizophrenia|ptsd|ocd|bpd|adhd)\b",
         r"\bдиагноз\b",
         r"\bdiagnos(e|is|ed)\b",
     ]
-]
+)
 
-_MEDICATION_PATTERNS = [
-    re.compile(p, re.IGNORECASE)
-    for p in [
+_MEDICATION_RE = _union(
+    [
         r"\b(прими|принимай|назначаю|рекомендую)\s+(таблетк|препарат|лекарств|антидепрессант)",
         r"\b(дозировк|дозу)\b",
         r"\b(take|prescribe|recommend)\s+(medication|pills|antidepressant|benzodiazepine)\b",
         r"\b(dosage|milligrams|mg)\b",
     ]
-]
+)
 
-_SAFETY_LEXICON_PATTERNS = [
-    re.compile(p, re.IGNORECASE)
-    for p in [
+_SAFETY_LEXICON_RE = _union(
+    [
         r"как\s+(причинить|навредить)\s+себе",
         r"how\s+to\s+(harm|hurt|kill)\s+(yourself|myself)",
         r"способ(ы|ов)?\s+(суицид|самоубийств)",
         r"method(s)?\s+of\s+(suicide|self.harm)",
     ]
-]
+)
+
+# Actionable-element markers (matched as substrings of the lowercased text)
+# Substring markers (not whole words: "try" also matches "trying"). "?" comes
+# first since most coaching replies end with a question and short-circuit there.
+_ACTION_MARKERS = (
+    "?",
+    "\u0441\u0434\u0435\u043b\u0430\u0439\u0442\u0435", "\u043d\u0430\u043f\u0438\u0448\u0438\u0442\u0435", "\u043e\u0446\u0435\u043d\u0438\u0442\u0435", "\u0432\u044b\u0431\u0435\u0440\u0438\u0442\u0435", "\u043d\u0430\u0437\u043e\u0432\u0438\u0442\u0435",
+    "\u043f\u043e\u043f\u0440\u043e\u0431\u0443\u0439\u0442\u0435", "\u0434\u0430\u0432\u0430\u0439\u0442\u0435", "\u0433\u043e\u0442\u043e\u0432\u044b",
+    "tell me", "rate", "choose", "try", "let's",
+)
+
+# Humor markers forbidden in crisis / escalation states
+_HUMOR_MARKERS = ("\U0001f602", "\U0001f923", "lol", "haha", "\u0445\u0430\u0445\u0430")
+
+
+# Byte tables for counting scripts on the UTF-8 encoding with C-level
+# bytes.translate/bytes.count. Lead bytes 0xD0-0xD3 start exactly the
+# U+0400-U+04FF block; U+0482-U+0489 in it are signs/marks, not letters.
+# Latin letters are ASCII plus the two non-ASCII letters lowercasing into a-z.
+_NOT_CYRILLIC_LEAD = bytes(b for b in range(256) if not 0xD0 <= b <= 0xD3)
+_NOT_ASCII_LETTER = bytes(b for b in range(256) if not (0x41 <= b <= 0x5A or 0x61 <= b <= 0x7A))
+_CYRILLIC_NON_LETTERS = tuple(chr(c).encode() for c in range(0x482, 0x48A))
+_EXTRA_LATIN_LETTERS = ("\u0130".encode(), "\u212a".encode())
+
+
+def _count_scripts(text: str) -> tuple[int, int, int]:
+    """Return ``(letters, cyrillic, latin)`` letter counts without a per-character Python loop."""
+    letters = sum(map(str.isalpha, text))
+    if not letters:
+        return 0, 0, 0
+    raw = text.encode("utf-8", "surrogatepass")
+    cyrillic = len(raw.translate(None, _NOT_CYRILLIC_LEAD))
+    if cyrillic:
+        cyrillic -= sum(raw.count(seq) for seq in _CYRILLIC_NON_LETTERS)
+    latin = len(raw.translate(None, _NOT_ASCII_LETTER)) + sum(raw.count(seq) for seq in _EXTRA_LATIN_LETTERS)
+    return letters, cyrillic, latin
 
 
 # ---------------------------------------------------------------------------
 # ResponseValidator (9 checks from the contract)
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ValidationResult:
     passed: bool
     code: str
@@ -165,115 +213,131 @@ class ValidationResult:
     critical: bool = False
 
 
+# Shared results for the happy path; frozen, so safe to hand out repeatedly
+_PASSED = {
+    code: ValidationResult(True, code)
+    for code in (
+        "length", "must_include", "must_not", "no_diagnosis", "no_medication",
+        "language_match", "state_alignment", "actionability", "safety_lexicon",
+    )
+}
+
+
+def _lowered(phrases: list[str]) -> tuple[str, ...]:
+    return _lower_tuple(tuple(phrases))
+
+
+@functools.lru_cache(maxsize=256)
+def _lower_tuple(phrases: tuple[str, ...]) -> tuple[str, ...]:
+    # Contracts are rebuilt per turn but their phrase lists repeat across turns and retries
+    return tuple(p.lower() for p in phrases)
+
+
+def _check_lexicon(pattern: re.Pattern[str], text: str, code: str, label: str) -> ValidationResult:
+    """Critical check shared by the regex-lexicon validators: fail on the first match."""
+    m = pattern.search(text)
+    if m is None:
+        return _PASSED[code]
+    return ValidationResult(False, code, f"{label}: {m.group()}", critical=True)
+
+
 class ResponseValidator:
     """Validates LLM output against the contract and safety rules."""
 
     def validate(self, text: str, contract: LLMContract) -> list[ValidationResult]:
         results: list[ValidationResult] = []
+        # Lowercased once; shared by every substring-based check
+        lower = text.lower()
 
         # 1) length
         results.append(self._check_length(text, contract))
         # 2) must_include
-        results.append(self._check_must_include(text, contract))
+        results.append(self._check_must_include(lower, contract, _lowered(contract.must_include)))
         # 3) must_not
-        results.append(self._check_must_not(text, contract))
+        results.append(self._check_must_not(lower, contract, _lowered(contract.must_not)))
         # 4) no_diagnosis
         results.append(self._check_no_diagnosis(text))
         # 5) no_medication
         results.append(self._check_no_medication(text))
         # 6) language_match
-        results.append(self._check_language_match(text, contract))
+        results.append(self._check_language_match(_count_scripts(text), contract))
         # 7) state_alignment
-        results.append(self._check_state_alignment(text, contract))
+        results.append(self._check_state_alignment(text, lower, contract))
         # 8) actionability
-        results.append(self._check_actionability(text))
+        results.append(self._check_actionability(lower))
         # 9) safety_lexicon
         results.append(self._check_safety_lexicon(text))
 
         return results
 
-    # -- individual checks --------------------------------------------------
-
-    def _check_length(self, text: str, contract: LLMContract) -> ValidationResult:
-        ok = len(text) <= contract.max_chars_per_message
-        return ValidationResult(
-            passed=ok,
-            code="length",
-            reason=f"len={len(text)}, max={contract.max_chars_per_message}" if not ok else None,
-        )
+    def validate_critical(self, text: str) -> ValidationResult | None:
+        """Run only the critical checks; return the first failure, if any."""
+        for check in (self._check_no_diagnosis, self._check_no_medication, self._check_safety_lexicon):
+            result = check(text)
+            if not result.passed:
+                return result
+        return None
 
-    def _check_must_include(self, text: str, contract: LLMContract) -> ValidationResult:
+    def validate_contract(self, text: str, contract: LLMContract) -> list[ValidationResult]:
+        """Run the non-critical contract checks (everything except validate_critical)."""
         lower = text.lower()
-        missing = [p for p in contract.must_include if p.lower() not in lower]
-        return ValidationResult(
-            passed=len(missing) == 0,
-            code="must_include",
-            reason=f"missing: {missing}" if missing else None,
-        )
+        return [
+            self._check_length(text, contract),
+            self._check_must_include(lower, contract, _lowered(contract.must_include)),
+            self._check_must_not(lower, contract, _lowered(contract.must_not)),
+            self._check_language_match(_count_scripts(text), contract),
+            self._check_state_alignment(text, lower, contract),
+            self._check_actionability(lower),
+        ]
 
-    def _check_must_not(self, text: str, contract: LLMContract) -> ValidationResult:
-        lower = text.lower()
-        found = [p for p in contract.must_not if p.lower() in lower]
-        return ValidationResult(
-            passed=len(found) == 0,
-            code="must_not",
-            reason=f"found: {found}" if found else None,
-        )
+    # -- individual checks --------------------------------------------------
+
+    def _check_length(self, text: str, contract: LLMContract) -> ValidationResult:
+        if len(text) <= contract.max_chars_per_message:
+            return _PASSED["length"]
+        return ValidationResult(False, "length", f"len={len(text)}, max={contract.max_chars_per_message}")
+
+    def _check_must_include(self, lower: str, contract: LLMContract, include: tuple[str, ...]) -> ValidationResult:
+        missing = [p for p, lp in zip(contract.must_include, include) if lp not in lower]
+        if not missing:
+            return _PASSED["must_include"]
+        return ValidationResult(False, "must_include", f"missing: {missing}")
+
+    def _check_must_not(self, lower: str, contract: LLMContract, exclude: tuple[str, ...]) -> ValidationResult:
+        found = [p for p, lp in zip(contract.must_not, exclude) if lp in lower]
+        if not found:
+            return _PASSED["must_not"]
+        return ValidationResult(False, "must_not", f"found: {found}")
 
     def _check_no_diagnosis(self, text: str) -> ValidationResult:
-        for pat in _DIAGNOSIS_PATTERNS:
-            m = pat.search(text)
-            if m:
-                return ValidationResult(
-                    passed=False,
-                    code="no_diagnosis",
-                    reason=f"diagnostic language: {m.group()}",
-                    critical=True,
-                )
-        return ValidationResult(passed=True, code="no_diagnosis")
+        return _check_lexicon(_DIAGNOSIS_RE, text, "no_diagnosis", "diagnostic language")
 
     def _check_no_medication(self, text: str) -> ValidationResult:
-        for pat in _MEDICATION_PATTERNS:
-            m = pat.search(text)
-            if m:
-                return ValidationResult(
-                    passed=False,
-                    code="no_medication",
-                    reason=f"medication language: {m.group()}",
-                    critical=True,
-                )
-        return ValidationResult(passed=True, code="no_medication")
+        return _check_lexicon(_MEDICATION_RE, text, "no_medication", "medication language")
 
-    def _check_language_match(self, text: str, contract: LLMContract) -> ValidationResult:
+    def _check_language_match(
+        self, counts: tuple[int, int, int], contract: LLMContract
+    ) -> ValidationResult:
+        letters, cyrillic, latin = counts
         if contract.language == "ru":
             # Heuristic: at least 30% Cyrillic characters among letters
-            letters = [c for c in text if c.isalpha()]
             if not letters:
-                return ValidationResult(passed=True, code="language_match")
-            cyrillic = sum(1 for c in letters if "\u0400" <= c <= "\u04ff")
-            ratio = cyrillic / len(letters)
-            ok = ratio >= 0.3
-            return ValidationResult(
-                passed=ok,
-                code="language_match",
-                reason=f"cyrillic ratio {ratio:.2f} < 0.3" if not ok else None,
-            )
+                return _PASSED["language_match"]
+            ratio = cyrillic / letters
+            if ratio >= 0.3:
+                return _PASSED["language_match"]
+            return ValidationResult(False, "language_match", f"cyrillic ratio {ratio:.2f} < 0.3")
         elif contract.language == "en":
-            letters = [c for c in text if c.isalpha()]
             if not letters:
-                return ValidationResult(passed=True, code="language_match")
-            latin = sum(1 for c in letters if "a" <= c.lower() <= "z")
-            ratio = latin / len(letters)
-            ok = ratio >= 0.3
-            return ValidationResult(
-                passed=ok,
-                code="language_match",
-                reason=f"latin ratio {ratio:.2f} < 0.3" if not ok else None,
-            )
+                return _PASSED["language_match"]
+            ratio = latin / letters
+            if ratio >= 0.3:
+                return _PASSED["language_match"]
+            return ValidationResult(False, "language_match", f"latin ratio {ratio:.2f} < 0.3")
         # Unknown language: pass
-        return ValidationResult(passed=True, code="language_match")
+        return _PASSED["language_match"]
 
-    def _check_state_alignment(self, text: str, contract: LLMContract) -> ValidationResult:
+    def _check_state_alignment(self, text: str, lower: str, contract: LLMContract) -> ValidationResult:
         """Simple heuristic: response should not be empty and should loosely
         match the dialogue state expectations."""
         if not text.strip():
@@ -284,10 +348,7 @@ class ResponseValidator:
             )
         # Crisis / escalation states must not contain humor markers
         if contract.dialogue_state in ("ESCALATION", "SAFETY_CHECK"):
-            humor = any(
-                m in text.lower()
-                for m in ["\U0001f602", "\U0001f923", "lol", "haha", "\u0445\u0430\u0445\u0430"]
-            )
+            humor = any(m in lower for m in _HUMOR_MARKERS)
             if humor:
                 return ValidationResult(
                     passed=False,
@@ -295,34 +356,16 @@ class ResponseValidator:
                     reason="humor in safety/escalation state",
                     critical=True,
                 )
-        return ValidationResult(passed=True, code="state_alignment")
+        return _PASSED["state_alignment"]
 
-    def _check_actionability(self, text: str) -> ValidationResult:
+    def _check_actionability(self, lower: str) -> ValidationResult:
         """Check that the response contains at least one actionable element."""
-        lower = text.lower()
-        markers = [
-            "\u0441\u0434\u0435\u043b\u0430\u0439\u0442\u0435", "\u043d\u0430\u043f\u0438\u0448\u0438\u0442\u0435", "\u043e\u0446\u0435\u043d\u0438\u0442\u0435", "\u0432\u044b\u0431\u0435\u0440\u0438\u0442\u0435", "\u043d\u0430\u0437\u043e\u0432\u0438\u0442\u0435",
-            "\u043f\u043e\u043f\u0440\u043e\u0431\u0443\u0439\u0442\u0435", "\u0434\u0430\u0432\u0430\u0439\u0442\u0435", "\u0433\u043e\u0442\u043e\u0432\u044b",
-            "tell me", "rate", "choose", "try", "let's", "?",
-        ]
-        has_action = any(m in lower for m in markers)
-        return ValidationResult(
-            passed=has_action,
-            code="actionability",
-            reason="no actionable element found" if not has_action else None,
-        )
+        if any(map(lower.__contains__, _ACTION_MARKERS)):
+            return _PASSED["actionability"]
+        return ValidationResult(False, "actionability", "no actionable element found")
 
     def _check_safety_lexicon(self, text: str) -> ValidationResult:
-        for pat in _SAFETY_LEXICON_PATTERNS:
-            m = pat.search(text)
-            if m:
-                return ValidationResult(
-                    passed=False,
-                    code="safety_lexicon",
-                    reason=f"harmful content: {m.group()}",
-                    critical=True,
-                )
-        return ValidationResult(passed=True, code="safety_lexicon")
+        return _check_lexicon(_SAFETY_LEXICON_RE, text, "safety_lexicon", "harmful content")
 
 
 # ---------------------------------------------------------------------------
@@ -335,14 +378,16 @@ class CircuitBreaker:
     def __init__(self, threshold: int = 3, window_seconds: float = 60.0) -> None:
         self.threshold = threshold
         self.window_seconds = window_seconds
-        self._failures: list[float] = []
+        self._failures: deque[float] = deque()
 
     def record_failure(self) -> None:
         self._failures.append(time.monotonic())
 
     def is_open(self) -> bool:
         now = time.monotonic()
-        self._failures = [t for t in self._failures if now - t < self.window_seconds]
+        # Timestamps are appended in monotonic order, so expired ones sit at the left
+        while self._failures and now - self._failures[0] >= self.window_seconds:
+            self._failures.popleft()
         return len(self._failures) >= self.threshold
 
     def reset(self) -> None:
@@ -371,6 +416,11 @@ class LLMAdapter:
         Model identifier for the LLM call.
     max_repeat_count:
         Maximum number of generation attempts (1 original + retries).
+    cache_size:
+        Number of validated responses kept for exact-match reuse (0 disables).
+    speculative:
+        Concurrent candidates requested on the first attempt; the first one to
+        pass validation wins and the rest are cancelled.
     """
 
     def __init__(
@@ -378,12 +428,17 @@ class LLMAdapter:
         llm_provider: object,
         model: str = "claude-sonnet-4-20250514",
         max_repeat_count: int = 2,
+        cache_size: int = 512,
+        speculative: int = 1,
     ) -> None:
         self._llm = llm_provider
         self._model = model
         self._max_repeat_count = max_repeat_count
         self._validator = ResponseValidator()
         self._breaker = CircuitBreaker(threshold=3, window_seconds=60.0)
+        self._cache_size = cache_size
+        self._cache: OrderedDict[bytes, str] = OrderedDict()
+        self._speculative = max(1, speculative)
 
     # -- public API ---------------------------------------------------------
 
@@ -397,78 +452,131 @@ class LLMAdapter:
 
         Returns validated LLM text or a safe fallback string.
         """
+        system_prompt = self._build_system_prompt(contract)
+        messages = self._build_messages(contract)
+
+        # Exact-match reuse of a previously validated response
+        cache_key = self._cache_key(system_prompt, messages, risk_level, user_tone_playful)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            self._cache.move_to_end(cache_key)
+            return cached
+
         # Circuit breaker check
         if self._breaker.is_open():
             logger.warning("Circuit breaker open — returning state fallback.")
             return self._get_fallback(contract.dialogue_state)
 
-        system_prompt = self._build_system_prompt(contract)
-        messages = self._build_messages(contract)
-
         for attempt in range(self._max_repeat_count):
+            width = self._speculative if attempt == 0 else 1
+            tasks = [
+                asyncio.create_task(self._call_llm(system_prompt, messages))
+                for _ in range(width)
+            ]
+            rejected: tuple[str, list[ValidationResult], list[CheckResult]] | None = None
+            critical = False
+            # One breaker failure per attempt, however many speculative calls fail
+            failure_recorded = False
             try:
-                raw = await self._call_llm(system_prompt, messages)
-            except Exception:
-                logger.exception("LLM call failed (attempt %d)", attempt + 1)
-                self._breaker.record_failure()
+                for next_done in asyncio.as_completed(tasks):
+                    try:
+                        raw = await next_done
+                    except Exception:
+                        logger.exception("LLM call failed (attempt %d)", attempt + 1)
+                        if not failure_recorded:
+                            self._breaker.record_failure()
+                            failure_recorded = True
+                        continue
+
+                    contract_failures, style_failures, is_critical = self._evaluate(
+                        raw, contract, risk_level, user_tone_playful,
+                    )
+                    if is_critical:
+                        if logger.isEnabledFor(logging.WARNING):
+                            logger.warning(
+                                "Critical validation failure on attempt %d: contract=%s style=%s",
+                                attempt + 1,
+                                [r.code for r in contract_failures if r.critical or r.code in _CRITICAL_CODES],
+                                [r.code for r in style_failures if r.code in _CRITICAL_CODES],
+                            )
+                        critical = True
+                        continue
+
+                    if not contract_failures and not style_failures:
+                        # All checks passed
+                        self._breaker.reset()
+                        self._cache_put(cache_key, raw)
+                        return raw
+
+                    if rejected is None:
+                        rejected = (raw, contract_failures, style_failures)
+            finally:
+                for task in tasks:
+                    task.cancel()
+                # Reap the losers so their exceptions are retrieved and none outlive the call
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+            if rejected is None:
+                if critical:
+                    # No candidate is salvageable -> immediate fallback
+                    if not failure_recorded:
+                        self._breaker.record_failure()
+                    return self._get_fallback(contract.dialogue_state)
                 continue
 
-            # --- contract validation (9 checks) ---
-            contract_results = self._validator.validate(raw, contract)
-            # --- style validation ---
-            style_input = StyleValidationInput(
-                text=raw,
-                risk_level=risk_level,
-                user_tone_playful=user_tone_playful,
-                long_form_requested=contract.max_chars_per_message > 500,
-            )
-            style_results = validate_style(style_input)
-
-            # Merge results
-            all_failures = [r for r in contract_results if not r.passed]
-            style_failures = [r for r in style_results if not r.passed]
-
-            # Check for critical failures -> immediate fallback
-            has_critical_contract = any(
-                r.critical or r.code in _CRITICAL_CODES for r in all_failures
-            )
-            has_critical_style = any(
-                r.code in _CRITICAL_CODES for r in style_failures
-            )
-
-            if has_critical_contract or has_critical_style:
-                logger.warning(
-                    "Critical validation failure on attempt %d: contract=%s style=%s",
-                    attempt + 1,
-                    [r.code for r in all_failures if r.critical or r.code in _CRITICAL_CODES],
-                    [r.code for r in style_failures if r.code in _CRITICAL_CODES],
-                )
-                self._breaker.record_failure()
-                return self._get_fallback(contract.dialogue_state)
-
-            # Non-critical failures
-            if not all_failures and not style_failures:
-                # All checks passed
-                self._breaker.reset()
-                return raw
-
-            # On first attempt with non-critical failures, retry with correction
+            raw, contract_failures, style_failures = rejected
+            # Non-critical failures: retry with correction while attempts remain
             if attempt < self._max_repeat_count - 1:
-                failure_codes = [r.code for r in all_failures] + [r.code for r in style_failures]
-                logger.info("Non-critical failures %s — retrying (attempt %d)", failure_codes, attempt + 1)
-                messages = self._build_correction_messages(contract, raw, all_failures, style_failures)
+                if logger.isEnabledFor(logging.INFO):
+                    failure_codes = [r.code for r in contract_failures] + [r.code for r in style_failures]
+                    logger.info("Non-critical failures %s — retrying (attempt %d)", failure_codes, attempt + 1)
+                messages = self._build_correction_messages(contract, raw, contract_failures, style_failures)
                 continue
 
             # Exhausted retries
             logger.warning("Exhausted retries — returning fallback.")
-            self._breaker.record_failure()
+            if not failure_recorded:
+                self._breaker.record_failure()
 
         return self._get_fallback(contract.dialogue_state)
 
+    def _evaluate(
+        self,
+        raw: str,
+        contract: LLMContract,
+        risk_level: RiskLevel,
+        user_tone_playful: bool,
+    ) -> tuple[list[ValidationResult], list[CheckResult], bool]:
+        """Run contract + style validation; return failures and whether any is critical.
+
+        Critical checks run first: a hit means fallback regardless of the rest,
+        so the remaining contract and style checks are skipped.
+        """
+        critical = self._validator.validate_critical(raw)
+        if critical is not None:
+            return [critical], [], True
+
+        contract_results = self._validator.validate_contract(raw, contract)
+        style_input = StyleValidationInput(
+            text=raw,
+            risk_level=risk_level,
+            user_tone_playful=user_tone_playful,
+            long_form_requested=contract.max_chars_per_message > 500,
+        )
+        style_results = validate_style(style_input)
+
+        contract_failures = [r for r in contract_results if not r.passed]
+        style_failures = [r for r in style_results if not r.passed]
+        is_critical = any(
+            r.critical or r.code in _CRITICAL_CODES for r in contract_failures
+        ) or any(r.code in _CRITICAL_CODES for r in style_failures)
+        return contract_failures, style_failures, is_critical
+
     # -- prompt building ----------------------------------------------------
 
-    def _build_system_prompt(self, contract: LLMContract) -> str:
-        parts = [STYLE_SYSTEM_PROMPT]
+    def _build_system_prompt(self, contract: LLMContract) -> list[dict]:
+        """Build system blocks: the cached style layer first, then the per-turn contract."""
+        parts = []
         if contract.persona_summary:
             parts.append(f"\n[PERSONA]\n{contract.persona_summary}")
         if contract.instruction:
@@ -480,12 +588,13 @@ class LLMAdapter:
         if contract.must_not:
             parts.append(f"must_not contain: {contract.must_not}")
         parts.append(f"language: {contract.language}")
-        return "\n".join(parts)
+        return [_STYLE_BLOCK, {"type": "text", "text": "\n".join(parts).lstrip()}]
 
     def _build_messages(self, contract: LLMContract) -> list[dict]:
-        messages: list[dict] = []
-        for m in contract.recent_messages:
-            messages.append({"role": m.get("role", "user"), "content": m.get("content", "")})
+        messages = [
+            {"role": m.get("role", "user"), "content": m.get("content", "")}
+            for m in contract.recent_messages
+        ]
         if contract.user_summary:
             messages.append({"role": "user", "content": f"[User context: {contract.user_summary}]"})
         if contract.user_response_to:
@@ -516,9 +625,30 @@ class LLMAdapter:
         base.append({"role": "user", "content": correction})
         return base
 
+    # -- response cache -----------------------------------------------------
+
+    @staticmethod
+    def _cache_key(
+        system: list[dict],
+        messages: list[dict],
+        risk_level: RiskLevel,
+        user_tone_playful: bool,
+    ) -> bytes:
+        # Style validation depends on risk level and tone, so both are part of the key
+        payload = json.dumps([system, messages, risk_level.value, user_tone_playful], ensure_ascii=False)
+        return hashlib.blake2b(payload.encode(), digest_size=16).digest()
+
+    def _cache_put(self, key: bytes, response: str) -> None:
+        if self._cache_size <= 0:
+            return
+        self._cache[key] = response
+        self._cache.move_to_end(key)
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
     # -- LLM call -----------------------------------------------------------
 
-    async def _call_llm(self, system: str, messages: list[dict]) -> str:
+    async def _call_llm(self, system: list[dict], messages: list[dict]) -> str:
         response = await self._llm.chat(
             messages=messages,
             system=system,
@@ -529,4 +659,4 @@ class LLMAdapter:
     # -- fallback -----------------------------------------------------------
 
     def _get_fallback(self, dialogue_state: str) -> str:
-        return STATE_FALLBACKS.get(dialogue_state, DEFAULT_FALLBACK)
+        return STATE_FALLBACKS.get(getattr(dialogue_state, "value", dialogue_state), DEFAULT_FALLBACK)
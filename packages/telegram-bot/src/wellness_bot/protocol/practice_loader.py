@@ -1,23 +1,39 @@
 """YAML practice loader with fail-fast validation."""
 from __future__ import annotations
 
-from dataclasses import dataclass
+import hashlib
+import json
+import logging
+from dataclasses import asdict, dataclass
 from pathlib import Path
 
 import yaml
 
+from wellness_bot.fs import atomic_write
 
-_VALID_CATEGORIES = {"monitoring", "attention", "cognitive", "behavioral", "micro"}
-_VALID_UI_MODES = {"text", "buttons", "timer", "text_input"}
-_VALID_BUTTON_ACTIONS = {"next", "fallback", "branch_extended", "branch_help", "backup_practice", "end"}
-_REQUIRED_FALLBACK_KEYS = {"user_confused", "cannot_now", "too_hard"}
+try:  # libyaml-backed parser when PyYAML was built with it
+    from yaml import CSafeLoader as _Loader
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader as _Loader
+
+
+logger = logging.getLogger(__name__)
+
+# Optional sidecar (in an explicit cache_dir) holding already-validated practices,
+# reused while no YAML file changed
+_CACHE_FORMAT = 1
+
+_VALID_CATEGORIES = frozenset(("monitoring", "attention", "cognitive", "behavioral", "micro"))
+_VALID_UI_MODES = frozenset(("text", "buttons", "timer", "text_input"))
+_VALID_BUTTON_ACTIONS = frozenset(("next", "fallback", "branch_extended", "branch_help", "backup_practice", "end"))
+_REQUIRED_FALLBACK_KEYS = frozenset(("user_confused", "cannot_now", "too_hard"))
 
 
 class PracticeValidationError(Exception):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class PracticeStep:
     index: int
     instruction_ru: str
@@ -27,7 +43,7 @@ class PracticeStep:
     buttons: list[dict] | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Practice:
     id: str
     version: str
@@ -48,79 +64,123 @@ class Practice:
 
 
 class PracticeLoader:
-    def __init__(self, practices_dir: Path | str) -> None:
+    def __init__(self, practices_dir: Path | str, cache_dir: Path | str | None = None) -> None:
         self._dir = Path(practices_dir)
+        # The sidecar never goes next to the YAML source; without cache_dir only the memo is used
+        self._cache_path: Path | None = None
+        if cache_dir is not None:
+            digest = hashlib.sha256(str(self._dir.resolve()).encode("utf-8")).hexdigest()[:16]
+            self._cache_path = Path(cache_dir) / f"practices-{digest}.json"
+        # In-process memo of the last load, keyed by the file stamps
+        self._memo: tuple[dict[str, list[int]], dict[str, Practice]] | None = None
+        # Directory listing, reused until the dir mtime moves (add/remove/rename)
+        self._dir_mtime: int | None = None
+        self._paths: list[Path] = []
 
     def load_all(self) -> dict[str, Practice]:
-        practices: dict[str, Practice] = {}
-        for path in sorted(self._dir.glob("*.yaml")):
-            practice = self._load_one(path)
-            practices[practice.id] = practice
-        return practices
+        paths = self._yaml_paths()
+        stamps = {}
+        for path in paths:
+            st = path.stat()
+            stamps[path.name] = [st.st_mtime_ns, st.st_size]
+
+        if self._memo is not None and self._memo[0] == stamps:
+            return dict(self._memo[1])
+
+        practices = self._read_cache(stamps)
+        if practices is None:
+            practices = {}
+            for path in paths:
+                practice = self._load_one(path)
+                practices[practice.id] = practice
+            self._write_cache(stamps, practices)
+        self._memo = (stamps, practices)
+        return dict(practices)
+
+    def _yaml_paths(self) -> list[Path]:
+        dir_mtime = self._dir.stat().st_mtime_ns
+        if dir_mtime != self._dir_mtime:
+            self._paths = sorted(self._dir.glob("*.yaml"))
+            self._dir_mtime = dir_mtime
+        return self._paths
+
+    def _read_cache(self, stamps: dict[str, list[int]]) -> dict[str, Practice] | None:
+        if self._cache_path is None:
+            return None
+        try:
+            with open(self._cache_path, "rb") as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if cache.get("format") != _CACHE_FORMAT or cache.get("files") != stamps:
+            return None
+        try:
+            practices = [
+                Practice(**{**p, "steps": [PracticeStep(**s) for s in p["steps"]]})
+                for p in cache["practices"]
+            ]
+        except (KeyError, TypeError):
+            return None
+        return {p.id: p for p in practices}
+
+    def _write_cache(self, stamps: dict[str, list[int]], practices: dict[str, Practice]) -> None:
+        """Best-effort: an unwritable cache dir or non-JSON practice data just means no sidecar."""
+        if self._cache_path is None:
+            return
+        cache = {
+            "format": _CACHE_FORMAT,
+            "files": stamps,
+            "practices": [asdict(p) for p in practices.values()],
+        }
+        try:
+            payload = json.dumps(cache, ensure_ascii=False).encode("utf-8")
+            # JSON turns non-string mapping keys (and tuples) into something else; only
+            # cache data that comes back exactly as YAML produced it
+            if json.loads(payload) != cache:
+                logger.debug("Practices in %s don't round-trip through JSON; not caching", self._dir)
+                return
+            atomic_write(self._cache_path, payload)
+        except (OSError, TypeError, ValueError):
+            logger.debug("Could not write practice cache to %s", self._cache_path, exc_info=True)
 
     def _load_one(self, path: Path) -> Practice:
-        with open(path) as f:
-            data = yaml.safe_load(f)
-
+        with open(path, "rb") as f:
+            data = yaml.load(f, Loader=_Loader)
+        try:
+            return self._build(data)
+        except KeyError as e:
+            raise PracticeValidationError(f"{path.name}: missing required key {e}") from None
+
+    def _build(self, data: dict) -> Practice:
         pid = data["id"]
 
         # Validate category
-        if data.get("category") not in _VALID_CATEGORIES:
-            raise PracticeValidationError(f"{pid}: invalid category '{data.get('category')}'")
+        category = data.get("category")
+        if category not in _VALID_CATEGORIES:
+            raise PracticeValidationError(f"{pid}: invalid category '{category}'")
+
+        # Required top-level fields up front, so a malformed file fails before any step work
+        version = data["version"]
+        name_ru = data["name_ru"]
+        goal = data["goal"]
+        duration_min = data["duration_min"]
+        duration_max = data["duration_max"]
+        priority_rank = data["priority_rank"]
 
         # Validate and build steps
-        steps = []
-        raw_steps = data.get("steps", [])
-        expected_index = 1
-        for s in raw_steps:
-            idx = s["index"]
-            if idx != expected_index:
-                raise PracticeValidationError(
-                    f"{pid}: step index continuity broken — expected {expected_index}, got {idx}"
-                )
-            expected_index += 1
-
-            # Validate ui_mode
-            if s.get("ui_mode") not in _VALID_UI_MODES:
-                raise PracticeValidationError(f"{pid} step {idx}: invalid ui_mode '{s.get('ui_mode')}'")
-
-            # Validate fallback keys
-            fallback = s.get("fallback", {})
-            missing = _REQUIRED_FALLBACK_KEYS - set(fallback.keys())
-            if missing:
-                raise PracticeValidationError(
-                    f"{pid} step {idx}: missing fallback keys: {missing}"
-                )
-
-            # Validate button actions
-            buttons = s.get("buttons")
-            if buttons:
-                for btn in buttons:
-                    if btn.get("action") not in _VALID_BUTTON_ACTIONS:
-                        raise PracticeValidationError(
-                            f"{pid} step {idx}: invalid button action '{btn.get('action')}'"
-                        )
-
-            steps.append(PracticeStep(
-                index=idx,
-                instruction_ru=s["instruction_ru"],
-                ui_mode=s["ui_mode"],
-                checkpoint=s.get("checkpoint", False),
-                fallback=fallback,
-                buttons=buttons,
-            ))
+        steps = [_build_step(pid, expected, s) for expected, s in enumerate(data.get("steps", []), 1)]
 
         return Practice(
             id=pid,
-            version=data["version"],
+            version=version,
             step_schema_hash=data.get("step_schema_hash", ""),
-            name_ru=data["name_ru"],
+            name_ru=name_ru,
             name_en=data.get("name_en", ""),
-            category=data["category"],
-            goal=data["goal"],
-            duration_min=data["duration_min"],
-            duration_max=data["duration_max"],
-            priority_rank=data["priority_rank"],
+            category=category,
+            goal=goal,
+            duration_min=duration_min,
+            duration_max=duration_max,
+            priority_rank=priority_rank,
             prerequisites=data.get("prerequisites", {}),
             safety_overrides=data.get("safety_overrides", {}),
             maintaining_cycles=data.get("maintaining_cycles", []),
@@ -128,3 +188,41 @@ class PracticeLoader:
             outcome=data.get("outcome", {}),
             resume_compatibility=data.get("resume_compatibility", {}),
         )
+
+
+def _build_step(pid: str, expected_index: int, s: dict) -> PracticeStep:
+    idx = s["index"]
+    if idx != expected_index:
+        raise PracticeValidationError(
+            f"{pid}: step index continuity broken — expected {expected_index}, got {idx}"
+        )
+
+    # Validate ui_mode
+    if s.get("ui_mode") not in _VALID_UI_MODES:
+        raise PracticeValidationError(f"{pid} step {idx}: invalid ui_mode '{s.get('ui_mode')}'")
+
+    # Validate fallback keys
+    fallback = s.get("fallback", {})
+    missing = _REQUIRED_FALLBACK_KEYS.difference(fallback)
+    if missing:
+        raise PracticeValidationError(
+            f"{pid} step {idx}: missing fallback keys: {missing}"
+        )
+
+    # Validate button actions
+    buttons = s.get("buttons")
+    if buttons:
+        for btn in buttons:
+            if btn.get("action") not in _VALID_BUTTON_ACTIONS:
+                raise PracticeValidationError(
+                    f"{pid} step {idx}: invalid button action '{btn.get('action')}'"
+                )
+
+    return PracticeStep(
+        index=idx,
+        instruction_ru=s["instruction_ru"],
+        ui_mode=s["ui_mode"],
+        checkpoint=s.get("checkpoint", False),
+        fallback=fallback,
+        buttons=buttons,
+    )
@@ -1,34 +1,63 @@
 """Repository layer with UnitOfWork for protocol engine."""
 from __future__ import annotations
 
-from datetime import datetime, timedelta, timezone
+import functools
+import sys
+import time
 from typing import Self
 
 import aiosqlite
 
+# Explicit column lists: rows map straight onto these, no cursor.description per query
+_SESSION_FIELDS = (
+    "id", "user_id", "session_type", "current_state", "started_at", "ended_at", "end_reason",
+    "last_user_activity_at", "resumable", "resume_practice_id", "resume_step_index",
+    "metadata_json", "created_at", "updated_at",
+)
+_SAFETY_EVENT_FIELDS = (
+    "id", "user_id", "session_id", "risk_level", "protocol_id", "immediacy", "signals_json",
+    "confidence", "source", "classifier_version", "policy_version", "message_locale",
+    "resource_set_version", "user_message_hash", "user_message_raw", "bot_response_text",
+    "handoff_status", "resolution", "timestamp_utc",
+)
+_TECHNIQUE_FIELDS = ("id", "user_id", "practice_id", "times_used", "avg_effectiveness", "last_used_at")
+
+_SELECT_ACTIVE_SESSION = (
+    f"SELECT {', '.join(_SESSION_FIELDS)} FROM dialogue_sessions WHERE user_id = ? AND ended_at IS NULL"
+)
+_SELECT_RECENT_SAFETY = (
+    f"SELECT {', '.join(_SAFETY_EVENT_FIELDS)} FROM safety_events "
+    "WHERE user_id = ? AND timestamp_utc >= ? ORDER BY timestamp_utc DESC"
+)
+_SELECT_TECHNIQUES = f"SELECT {', '.join(_TECHNIQUE_FIELDS)} FROM technique_history WHERE user_id = ?"
+
+
+def _utc_now_iso(offset_seconds: float = 0.0) -> str:
+    """UTC timestamp in isoformat layout (always with microseconds), without a datetime object."""
+    t = time.time() + offset_seconds
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(t)) + f".{int(t % 1 * 1e6):06d}+00:00"
+
+
+@functools.lru_cache(maxsize=64)
+def _build_insert(table: str, cols: tuple[str, ...]) -> str:
+    # Callers pass the same few column sets; reusing the identical SQL string also
+    # keeps hitting sqlite3's per-connection statement cache
+    return f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})"
+
 
 class SessionRepository:
     def __init__(self, db: aiosqlite.Connection) -> None:
         self._db = db
 
     async def create(self, **kwargs: object) -> None:
-        cols = ", ".join(kwargs.keys())
-        placeholders = ", ".join("?" for _ in kwargs)
-        await self._db.execute(
-            f"INSERT INTO dialogue_sessions ({cols}) VALUES ({placeholders})",
-            tuple(kwargs.values()),
-        )
+        await self._db.execute(_build_insert("dialogue_sessions", tuple(kwargs)), tuple(kwargs.values()))
 
     async def get_active(self, user_id: int) -> dict | None:
-        cursor = await self._db.execute(
-            "SELECT * FROM dialogue_sessions WHERE user_id = ? AND ended_at IS NULL",
-            (user_id,),
-        )
+        cursor = await self._db.execute(_SELECT_ACTIVE_SESSION, (user_id,))
         row = await cursor.fetchone()
         if row is None:
             return None
-        cols = [d[0] for d in cursor.description]
-        return dict(zip(cols, row))
+        return dict(zip(_SESSION_FIELDS, row))
 
     async def update_state(self, session_id: str, new_state: str, updated_at: str) -> None:
         await self._db.execute(
@@ -55,21 +84,12 @@ class SafetyRepository:
         self._db = db
 
     async def log_event(self, **kwargs: object) -> None:
-        cols = ", ".join(kwargs.keys())
-        placeholders = ", ".join("?" for _ in kwargs)
-        await self._db.execute(
-            f"INSERT INTO safety_events ({cols}) VALUES ({placeholders})",
-            tuple(kwargs.values()),
-        )
+        await self._db.execute(_build_insert("safety_events", tuple(kwargs)), tuple(kwargs.values()))
 
     async def get_recent(self, user_id: int, window_minutes: int) -> list[dict]:
-        cutoff = (datetime.now(timezone.utc) - timedelta(minutes=window_minutes)).isoformat()
-        cursor = await self._db.execute(
-            "SELECT * FROM safety_events WHERE user_id = ? AND timestamp_utc >= ? ORDER BY timestamp_utc DESC",
-            (user_id, cutoff),
-        )
-        cols = [d[0] for d in cursor.description]
-        return [dict(zip(cols, row)) for row in await cursor.fetchall()]
+        cutoff = _utc_now_iso(-60.0 * window_minutes)
+        cursor = await self._db.execute(_SELECT_RECENT_SAFETY, (user_id, cutoff))
+        return [dict(zip(_SAFETY_EVENT_FIELDS, row)) for row in await cursor.fetchall()]
 
 
 class IdempotencyRepository:
@@ -83,7 +103,7 @@ class IdempotencyRepository:
         return await cursor.fetchone() is not None
 
     async def mark_processed(self, key: str) -> None:
-        now = datetime.now(timezone.utc).isoformat()
+        now = _utc_now_iso()
         await self._db.execute(
             "INSERT OR IGNORE INTO processed_events (idempotency_key, processed_at) VALUES (?, ?)",
             (key, now),
@@ -95,7 +115,7 @@ class TechniqueHistoryRepository:
         self._db = db
 
     async def upsert_stats(self, id: str, user_id: int, practice_id: str, delta: int) -> None:
-        now = datetime.now(timezone.utc).isoformat()
+        now = _utc_now_iso()
         await self._db.execute(
             """INSERT INTO technique_history (id, user_id, practice_id, times_used, avg_effectiveness, last_used_at)
                VALUES (?, ?, ?, 1, ?, ?)
@@ -107,23 +127,26 @@ class TechniqueHistoryRepository:
         )
 
     async def get_stats(self, user_id: int) -> list[dict]:
-        cursor = await self._db.execute(
-            "SELECT * FROM technique_history WHERE user_id = ?", (user_id,)
-        )
-        cols = [d[0] for d in cursor.description]
-        return [dict(zip(cols, row)) for row in await cursor.fetchall()]
+        cursor = await self._db.execute(_SELECT_TECHNIQUES, (user_id,))
+        stats = [dict(zip(_TECHNIQUE_FIELDS, row)) for row in await cursor.fetchall()]
+        # practice_id comes from a small fixed catalog; share one string object per id
+        for s in stats:
+            s["practice_id"] = sys.intern(s["practice_id"])
+        return stats
 
 
 class SQLiteUnitOfWork:
-    def __init__(self, db: aiosqlite.Connection) -> None:
+    def __init__(self, db: aiosqlite.Connection, readonly: bool = False) -> None:
         self._db = db
+        # Read-only sections take a deferred transaction so they don't grab the write lock
+        self._readonly = readonly
         self.sessions = SessionRepository(db)
         self.safety = SafetyRepository(db)
         self.idempotency = IdempotencyRepository(db)
         self.techniques = TechniqueHistoryRepository(db)
 
     async def __aenter__(self) -> Self:
-        await self._db.execute("BEGIN IMMEDIATE")
+        await self._db.execute("BEGIN DEFERRED" if self._readonly else "BEGIN IMMEDIATE")
         return self
 
     async def __aexit__(self, exc_type: type | None, exc_val: BaseException | None, exc_tb: object) -> None:
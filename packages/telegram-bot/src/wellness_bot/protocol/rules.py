@@ -1,6 +1,7 @@
 """Deterministic rule engine for practice selection."""
 from __future__ import annotations
 
+import functools
 from dataclasses import dataclass
 from wellness_bot.protocol.types import (
     MaintainingCycle, Readiness, CautionLevel,
@@ -53,22 +54,96 @@ _SECOND_LINE: dict[str, list[str]] = {
     "symptom_fixation": ["C2"],
 }
 
+
+def _cycle_weights(cycle: str | None) -> dict[str, float]:
+    first_line = _FIRST_LINE.get(cycle, ())
+    second_line = _SECOND_LINE.get(cycle, ())
+    weights = {}
+    for p in _CATALOG:
+        pid = p["id"]
+        if pid in first_line:
+            weights[pid] = 1.0
+        elif pid in second_line:
+            weights[pid] = 0.5
+        elif not p["cycles"]:  # universal (M3, U2)
+            weights[pid] = 0.3
+        else:
+            weights[pid] = 0.0
+    return weights
+
+
+# Step 3 cycle-match weight for every (cycle, practice) pair, resolved at import so
+# scoring does one dict read per candidate instead of the line-membership branches
+_CYCLE_MATCH: dict[str, dict[str, float]] = {
+    k: _cycle_weights(k) for k in _FIRST_LINE.keys() | _SECOND_LINE.keys()
+}
+_UNMAPPED_CYCLE_MATCH = _cycle_weights(None)
+_NO_HISTORY: dict = {}
+
 _READINESS_ORDER = ["precontemplation", "contemplation", "action", "maintenance"]
+_READINESS_IDX = {v: i for i, v in enumerate(_READINESS_ORDER)}
+
+# Hard-filter columns unpacked once at import, so get_eligible reads locals instead
+# of doing dict lookups per catalog row: (row, blocked_distress, blocked_caution_elevated, dur_min)
+_Gate = tuple[dict, int | None, bool, int]
 
 
-@dataclass
+def _gate(p: dict) -> _Gate:
+    return (p, p["blocked_distress"], p["blocked_caution_elevated"], p["dur_min"])
+
+
+# Pre-indexed by readiness rank: slot i holds the rows whose readiness gate passes at
+# rank i; precontemplation (rank 0) is further limited to the basics M3 and U2
+_GATES_BY_READINESS: tuple[tuple[_Gate, ...], ...] = tuple(
+    tuple(
+        _gate(p)
+        for p in _CATALOG
+        if _READINESS_IDX[p["min_readiness"]] <= i and (i > 0 or p["id"] in ("M3", "U2"))
+    )
+    for i in range(len(_READINESS_ORDER))
+)
+
+
+@dataclass(slots=True)
 class PracticeCandidate:
     practice_id: str
     score: float
     priority_rank: int
 
 
-@dataclass
+@dataclass(slots=True)
 class SelectionResult:
     primary: PracticeCandidate
     backup: PracticeCandidate | None
 
 
+@functools.lru_cache(maxsize=4096)
+def _eligible(distress: int, time_budget: int, readiness_idx: int, elevated: bool) -> tuple[dict, ...]:
+    # Pure function of its arguments over the static catalog; the cycle does not gate.
+    # Plain int/bool keys hash in C (enum members go through Enum.__hash__), and
+    # caution levels other than ELEVATED share cache entries.
+    eligible = []
+    # Readiness and precontemplation gates are already applied by the pre-index
+    for p, blocked_distress, blocked_caution, dur_min in _GATES_BY_READINESS[readiness_idx]:
+        # Distress gate
+        if blocked_distress is not None and distress >= blocked_distress:
+            continue
+        # Caution gate
+        if elevated and blocked_caution:
+            continue
+        # Time gate
+        if dur_min > time_budget:
+            continue
+        eligible.append(p)
+    return tuple(eligible)
+
+
+def _outranks(a: PracticeCandidate, b: PracticeCandidate) -> bool:
+    if a.score != b.score:
+        return a.score > b.score
+    return a.priority_rank < b.priority_rank
+
+
 class RuleEngine:
     def get_eligible(
         self,
@@ -79,27 +154,9 @@ class RuleEngine:
         caution: CautionLevel,
     ) -> list[dict]:
         """Step 2: Hard filter — return eligible practices."""
-        readiness_idx = _READINESS_ORDER.index(readiness.value)
-        eligible = []
-        for p in _CATALOG:
-            # Distress gate
-            if p["blocked_distress"] is not None and distress >= p["blocked_distress"]:
-                continue
-            # Caution gate
-            if caution == CautionLevel.ELEVATED and p["blocked_caution_elevated"]:
-                continue
-            # Time gate
-            if p["dur_min"] > time_budget:
-                continue
-            # Readiness gate
-            p_readiness_idx = _READINESS_ORDER.index(p["min_readiness"])
-            if readiness_idx < p_readiness_idx:
-                continue
-            # Precontemplation: only M3 and U2
-            if readiness == Readiness.PRECONTEMPLATION and p["id"] not in ("M3", "U2"):
-                continue
-            eligible.append(p)
-        return eligible
+        return list(_eligible(
+            distress, time_budget, _READINESS_IDX[readiness.value], caution == CautionLevel.ELEVATED,
+        ))
 
     def select(
         self,
@@ -114,24 +171,16 @@ class RuleEngine:
         # Step 2: hard filter
         eligible = self.get_eligible(distress, cycle, time_budget, readiness, caution)
 
-        first_line = _FIRST_LINE.get(cycle.value, [])
-        second_line = _SECOND_LINE.get(cycle.value, [])
+        cycle_weights = _CYCLE_MATCH.get(cycle.value, _UNMAPPED_CYCLE_MATCH)
 
         scored: list[PracticeCandidate] = []
         for p in eligible:
             pid = p["id"]
             # Step 3: cycle match
-            if pid in first_line:
-                cycle_match = 1.0
-            elif pid in second_line:
-                cycle_match = 0.5
-            elif not p["cycles"]:  # universal (M3, U2)
-                cycle_match = 0.3
-            else:
-                cycle_match = 0.0
+            cycle_match = cycle_weights[pid]
 
             # Step 4: score
-            history = technique_history.get(pid, {})
+            history = technique_history.get(pid, _NO_HISTORY)
             times_used = history.get("times_used", 0)
             avg_eff = history.get("avg_effectiveness", 5.0)
 
@@ -153,17 +202,22 @@ class RuleEngine:
                 priority_rank=p["rank"],
             ))
 
-        # Step 5: sort by score desc, then priority_rank asc (tiebreaker)
-        scored.sort(key=lambda c: (-c.score, c.priority_rank))
-
-        if not scored:
+        # Step 5: top two by score desc, then priority_rank asc (tiebreaker).
+        # Single pass; priority_rank is only read on a score tie and earlier
+        # candidates win full ties, matching a stable sort.
+        primary: PracticeCandidate | None = None
+        backup: PracticeCandidate | None = None
+        for c in scored:
+            if primary is None or _outranks(c, primary):
+                primary, backup = c, primary
+            elif backup is None or _outranks(c, backup):
+                backup = c
+
+        if primary is None:
             # Fallback: U2 is always safe
             return SelectionResult(
                 primary=PracticeCandidate("U2", 0.1, 1),
                 backup=None,
             )
 
-        primary = scored[0]
-        backup = scored[1] if len(scored) > 1 else None
-
         return SelectionResult(primary=primary, backup=backup)
@@ -1,14 +1,18 @@
 """Two-layer safety classifier: hard rules + LLM."""
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import re
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
+
+from pydantic import BaseModel
 
 from wellness_bot.protocol.types import RiskLevel
+from wellness_bot.text_cache import cached_short
 
 
-@dataclass
+@dataclass(slots=True)
 class SafetyResult:
     risk_level: RiskLevel
     protocol_id: str | None = None
@@ -23,6 +27,16 @@ class SafetyResult:
         return hashlib.sha256(text.encode()).hexdigest()
 
 
+class _LLMSafetyReply(BaseModel):
+    """Shape of the Layer 2 JSON reply; parsed and validated in one pydantic-core pass."""
+
+    risk_level: RiskLevel
+    protocol: str | None = None
+    immediacy: str | None = None
+    signals: list[str] = []
+    confidence: float = 0.5
+
+
 # Hard-coded crisis patterns — Layer 1
 _CRISIS_PATTERNS: list[tuple[str, str, str]] = [
     # (pattern, protocol_id, signal_name)
@@ -53,7 +67,24 @@ _CRISIS_PATTERNS: list[tuple[str, str, str]] = [
     (r"боюсь\s+партн[её]р", "S6", "dv_fear_ru"),
 ]
 
-_COMPILED_PATTERNS = [(re.compile(p, re.IGNORECASE), proto, sig) for p, proto, sig in _CRISIS_PATTERNS]
+# Patterns are all lowercase and run against text.lower(), so no per-character IGNORECASE folding
+_COMPILED_PATTERNS = [(re.compile(p), proto, sig) for p, proto, sig in _CRISIS_PATTERNS]
+# One alternation over every pattern: a single C-level scan clears the common no-crisis message
+_CRISIS_UNION = re.compile("|".join(f"(?:{p})" for p, _, _ in _CRISIS_PATTERNS))
+
+
+def _match_crisis(text: str) -> tuple[str, str] | None:
+    """(protocol_id, signal) of the first matching pattern in lowercased text, or None."""
+    if _CRISIS_UNION.search(text) is None:
+        return None
+    # Hit: walk the ordered list so the reported protocol/signal stays list-priority based
+    for pattern, protocol_id, signal_name in _COMPILED_PATTERNS:
+        if pattern.search(text):
+            return protocol_id, signal_name
+    return None
+
+
+_match_crisis_cached = cached_short(_match_crisis)
 
 
 class SafetyClassifier:
@@ -66,22 +97,26 @@ class SafetyClassifier:
         self.classifier_version = classifier_version
         self.policy_version = policy_version
         self._llm = llm_provider
+        # Prompt -> in-flight Layer 2 call; concurrent identical turns share one request
+        self._inflight: dict[str, asyncio.Future[SafetyResult]] = {}
 
     def check_hard_rules(self, text: str) -> SafetyResult | None:
         """Layer 1: instant pattern matching. Returns None if no match."""
-        for pattern, protocol_id, signal_name in _COMPILED_PATTERNS:
-            if pattern.search(text):
-                return SafetyResult(
-                    risk_level=RiskLevel.CRISIS,
-                    protocol_id=protocol_id,
-                    immediacy="possible",
-                    signals=[signal_name],
-                    confidence=1.0,
-                    source="rules",
-                    classifier_version=self.classifier_version,
-                    policy_version=self.policy_version,
-                )
-        return None
+        text = text.lower()
+        hit = _match_crisis_cached(text)
+        if hit is None:
+            return None
+        protocol_id, signal_name = hit
+        return SafetyResult(
+            risk_level=RiskLevel.CRISIS,
+            protocol_id=protocol_id,
+            immediacy="possible",
+            signals=[signal_name],
+            confidence=1.0,
+            source="rules",
+            classifier_version=self.classifier_version,
+            policy_version=self.policy_version,
+        )
 
     async def classify(self, text: str, context: list[dict]) -> SafetyResult:
         """Full two-layer classification: hard rules first, then LLM."""
@@ -106,13 +141,24 @@ class SafetyClassifier:
 
     async def _classify_with_llm(self, text: str, context: list[dict]) -> SafetyResult:
         """Layer 2: LLM-based classification using haiku."""
-        import json
-
         context_str = " | ".join(
             f"{m.get('role', '?')}: {m.get('content', '')[:100]}"
             for m in context[-3:]
         )
 
+        prompt = f"User message: \"{text}\"\nRecent context: \"{context_str}\""
+
+        pending = self._inflight.get(prompt)
+        if pending is None:
+            pending = asyncio.ensure_future(self._request_llm(prompt))
+            self._inflight[prompt] = pending
+            pending.add_done_callback(lambda _: self._inflight.pop(prompt, None))
+        # Shielded so one waiter being cancelled doesn't cancel the call for the others
+        result = await asyncio.shield(pending)
+        # Each waiter gets its own copy, so one caller mutating signals can't affect another
+        return replace(result, signals=list(result.signals))
+
+    async def _request_llm(self, prompt: str) -> SafetyResult:
         system = (
             "You are a safety classifier for a wellness bot. "
             "Classify this message for risk level. "
@@ -122,38 +168,34 @@ class SafetyClassifier:
             '"signals":["list"],"confidence":0.0-1.0}'
         )
 
-        prompt = f"User message: \"{text}\"\nRecent context: \"{context_str}\""
-
         try:
             response = await self._llm.chat(
                 messages=[{"role": "user", "content": prompt}],
                 system=system,
                 model="claude-haiku-4-5-20251001",
             )
-            data = json.loads(response.content)
-
-            risk = RiskLevel(data["risk_level"])
-            confidence = float(data.get("confidence", 0.5))
+            reply = _LLMSafetyReply.model_validate_json(response.content)
+            confidence = reply.confidence
 
             # Classification logic per design:
             if confidence >= 0.7:
                 return SafetyResult(
-                    risk_level=risk,
-                    protocol_id=data.get("protocol"),
-                    immediacy=data.get("immediacy", "none"),
-                    signals=data.get("signals", []),
+                    risk_level=reply.risk_level,
+                    protocol_id=reply.protocol,
+                    immediacy=reply.immediacy or "none",
+                    signals=reply.signals,
                     confidence=confidence,
                     source="model",
                     classifier_version=self.classifier_version,
                     policy_version=self.policy_version,
                 )
-            elif risk == RiskLevel.CRISIS:
+            elif reply.risk_level == RiskLevel.CRISIS:
                 # Safety > precision: escalate even at low confidence
                 return SafetyResult(
                     risk_level=RiskLevel.CRISIS,
-                    protocol_id=data.get("protocol"),
-                    immediacy=data.get("immediacy", "possible"),
-                    signals=data.get("signals", []) + ["low_confidence_crisis"],
+                    protocol_id=reply.protocol,
+                    immediacy=reply.immediacy or "possible",
+                    signals=reply.signals + ["low_confidence_crisis"],
                     confidence=confidence,
                     source="model",
                     classifier_version=self.classifier_version,
@@ -163,7 +205,7 @@ class SafetyClassifier:
                 # Low confidence, not crisis → CAUTION_MILD (never SAFE when uncertain)
                 return SafetyResult(
                     risk_level=RiskLevel.CAUTION_MILD,
-                    signals=data.get("signals", []) + ["low_confidence"],
+                    signals=reply.signals + ["low_confidence"],
                     confidence=confidence,
                     source="model",
                     classifier_version=self.classifier_version,
@@ -3,7 +3,21 @@ from __future__ import annotations
 
 import aiosqlite
 
+# Per-connection settings (journal_mode=WAL also persists in the file): WAL lets readers
+# run alongside the single writer and, with synchronous=NORMAL, commits skip the fsync
+# until checkpoint. Anything opening its own connection must apply these again.
+# foreign_keys is left at the SQLite default so enforcement doesn't change here.
+CONNECTION_PRAGMAS = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=MEMORY;
+PRAGMA mmap_size=268435456;
+PRAGMA cache_size=-65536;
+PRAGMA busy_timeout=30000;
+"""
+
 PROTOCOL_SCHEMA = """
+-- Optional enum columns need no "OR col IS NULL": NULL IN (...) is NULL, which CHECK accepts
 CREATE TABLE IF NOT EXISTS dialogue_sessions (
     id TEXT PRIMARY KEY,
     user_id INTEGER NOT NULL,
@@ -14,7 +28,7 @@ CREATE TABLE IF NOT EXISTS dialogue_sessions (
          'MODULE_SELECT','PRACTICE','REFLECTION','REFLECTION_LITE','HOMEWORK','SESSION_END')),
     started_at TEXT NOT NULL,
     ended_at TEXT,
-    end_reason TEXT CHECK(end_reason IN ('completed','user_stop','timeout','crisis_reentry') OR end_reason IS NULL),
+    end_reason TEXT CHECK(end_reason IN ('completed','user_stop','timeout','crisis_reentry')),
     last_user_activity_at TEXT NOT NULL,
     resumable INTEGER NOT NULL DEFAULT 0 CHECK(resumable IN (0,1)),
     resume_practice_id TEXT,
@@ -23,8 +37,11 @@ CREATE TABLE IF NOT EXISTS dialogue_sessions (
     created_at TEXT NOT NULL,
     updated_at TEXT NOT NULL
 );
-CREATE INDEX IF NOT EXISTS idx_sessions_active
-    ON dialogue_sessions(user_id, ended_at, last_user_activity_at);
+-- (user_id, ended_at) serves both the live-session lookup (ended_at IS NULL) and history;
+-- last_user_activity_at is left out since touch_activity rewrites it on every message
+DROP INDEX IF EXISTS idx_sessions_active;
+CREATE INDEX IF NOT EXISTS idx_sessions_history
+    ON dialogue_sessions(user_id, ended_at DESC);
 CREATE UNIQUE INDEX IF NOT EXISTS idx_one_active_session
     ON dialogue_sessions(user_id) WHERE ended_at IS NULL;
 
@@ -57,7 +74,7 @@ CREATE TABLE IF NOT EXISTS practice_sessions (
         CHECK(status IN ('in_progress','completed','dropped','paused')),
     pre_rating INTEGER CHECK(pre_rating BETWEEN 0 AND 10),
     post_rating INTEGER CHECK(post_rating BETWEEN 0 AND 10),
-    drop_reason TEXT CHECK(drop_reason IN ('timeout','user_stop','too_hard','crisis_reentry') OR drop_reason IS NULL),
+    drop_reason TEXT CHECK(drop_reason IN ('timeout','user_stop','too_hard','crisis_reentry')),
     timer_state_json TEXT,
     started_at TEXT NOT NULL,
     completed_at TEXT,
@@ -74,8 +91,8 @@ CREATE TABLE IF NOT EXISTS practice_checkpoints (
     step_index INTEGER NOT NULL,
     user_response TEXT,
     button_action TEXT CHECK(button_action IN
-        ('next','fallback','branch_extended','branch_help','backup_practice','end') OR button_action IS NULL),
-    fallback_used TEXT CHECK(fallback_used IN ('user_confused','cannot_now','too_hard') OR fallback_used IS NULL),
+        ('next','fallback','branch_extended','branch_help','backup_practice','end')),
+    fallback_used TEXT CHECK(fallback_used IN ('user_confused','cannot_now','too_hard')),
     timestamp_utc TEXT NOT NULL,
     UNIQUE(practice_session_id, step_index)
 );
@@ -86,7 +103,7 @@ CREATE TABLE IF NOT EXISTS homework (
     session_id TEXT NOT NULL REFERENCES dialogue_sessions(id) ON DELETE RESTRICT,
     practice_id TEXT NOT NULL,
     assignment_text TEXT NOT NULL,
-    frequency TEXT CHECK(frequency IN ('daily','2x_day','weekly','once') OR frequency IS NULL),
+    frequency TEXT CHECK(frequency IN ('daily','2x_day','weekly','once')),
     assigned_at TEXT NOT NULL,
     due_at TEXT,
     status TEXT NOT NULL DEFAULT 'assigned'
@@ -135,8 +152,8 @@ CREATE TABLE IF NOT EXISTS safety_events (
     user_id INTEGER NOT NULL,
     session_id TEXT REFERENCES dialogue_sessions(id) ON DELETE RESTRICT,
     risk_level TEXT NOT NULL CHECK(risk_level IN ('SAFE','CAUTION_MILD','CAUTION_ELEVATED','CRISIS')),
-    protocol_id TEXT CHECK(protocol_id IN ('S1','S2','S3','S4','S5','S6','S7') OR protocol_id IS NULL),
-    immediacy TEXT CHECK(immediacy IN ('none','possible','imminent') OR immediacy IS NULL),
+    protocol_id TEXT CHECK(protocol_id IN ('S1','S2','S3','S4','S5','S6','S7')),
+    immediacy TEXT CHECK(immediacy IN ('none','possible','imminent')),
     signals_json TEXT NOT NULL,
     confidence REAL NOT NULL,
     source TEXT NOT NULL CHECK(source IN ('rules','model')),
@@ -148,17 +165,23 @@ CREATE TABLE IF NOT EXISTS safety_events (
     user_message_raw TEXT,
     bot_response_text TEXT,
     handoff_status TEXT CHECK(handoff_status IN
-        ('offered','accepted','connected','failed','timeout','declined') OR handoff_status IS NULL),
-    resolution TEXT CHECK(resolution IN ('resolved','unresolved','no_response') OR resolution IS NULL),
+        ('offered','accepted','connected','failed','timeout','declined')),
+    resolution TEXT CHECK(resolution IN ('resolved','unresolved','no_response')),
     timestamp_utc TEXT NOT NULL
 );
 CREATE INDEX IF NOT EXISTS idx_safety_user ON safety_events(user_id, timestamp_utc);
-CREATE INDEX IF NOT EXISTS idx_safety_crisis ON safety_events(risk_level) WHERE risk_level = 'CRISIS';
+-- Partial index over crisis rows keyed like idx_safety_user: "recent crises for a user"
+-- reads in timestamp order with no sort; replaces the single-column idx_safety_crisis
+DROP INDEX IF EXISTS idx_safety_crisis;
+CREATE INDEX IF NOT EXISTS idx_safety_crisis_recent
+    ON safety_events(user_id, timestamp_utc DESC) WHERE risk_level = 'CRISIS';
 
+-- Pure key lookup table: WITHOUT ROWID stores rows in the PK B-tree itself
+-- (one tree instead of rowid table + PK index); short keys keep rows inline
 CREATE TABLE IF NOT EXISTS processed_events (
-    idempotency_key TEXT PRIMARY KEY,
+    idempotency_key TEXT PRIMARY KEY CHECK(length(idempotency_key) < 200),
     processed_at TEXT NOT NULL
-);
+) WITHOUT ROWID;
 CREATE INDEX IF NOT EXISTS idx_processed_ttl ON processed_events(processed_at);
 
 CREATE TABLE IF NOT EXISTS technique_history (
@@ -185,6 +208,28 @@ CREATE TABLE IF NOT EXISTS validation_events (
 """
 
 
+async def apply_connection_pragmas(db: aiosqlite.Connection) -> None:
+    """Apply CONNECTION_PRAGMAS. In-memory databases keep journal_mode=memory."""
+    await db.executescript(CONNECTION_PRAGMAS)
+
+
+async def refresh_planner_stats(db: aiosqlite.Connection) -> None:
+    """Let SQLite re-ANALYZE tables whose stats are stale, sampling at most ~1000 rows per index."""
+    await db.executescript("PRAGMA analysis_limit=1000;\nPRAGMA optimize;")
+
+
+async def apply_schema_script(db: aiosqlite.Connection, script: str) -> None:
+    """Run a DDL script as one transaction: a single commit instead of one per statement."""
+    try:
+        await db.executescript(f"BEGIN;\n{script}\nCOMMIT;")
+    except Exception:
+        if db.in_transaction:
+            await db.rollback()
+        raise
+
+
 async def apply_protocol_schema(db: aiosqlite.Connection) -> None:
     """Apply protocol engine schema. Idempotent (IF NOT EXISTS)."""
-    await db.executescript(PROTOCOL_SCHEMA)
+    await apply_connection_pragmas(db)
+    await apply_schema_script(db, PROTOCOL_SCHEMA)
+    await refresh_planner_stats(db)
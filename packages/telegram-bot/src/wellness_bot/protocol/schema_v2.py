@@ -10,7 +10,15 @@ from __future__ import annotations
 
 import aiosqlite
 
+from wellness_bot.protocol.schema import (
+    apply_connection_pragmas,
+    apply_schema_script,
+    refresh_planner_stats,
+)
+
 COACHING_SCHEMA = """
+-- Append-only logs use a plain INTEGER PRIMARY KEY (rowid alias): nothing deletes rows,
+-- so AUTOINCREMENT's sqlite_sequence write per insert bought no extra guarantee
 -- ───────── users ─────────
 CREATE TABLE IF NOT EXISTS users (
     id          TEXT PRIMARY KEY,
@@ -41,7 +49,7 @@ CREATE TABLE IF NOT EXISTS sessions (
 
 -- ───────── messages ─────────
 CREATE TABLE IF NOT EXISTS messages (
-    id         INTEGER PRIMARY KEY AUTOINCREMENT,
+    id         INTEGER PRIMARY KEY,
     session_id TEXT NOT NULL REFERENCES sessions(id),
     role       TEXT NOT NULL CHECK (role IN ('user', 'assistant')),
     text       TEXT NOT NULL,
@@ -51,7 +59,7 @@ CREATE TABLE IF NOT EXISTS messages (
 
 -- ───────── mood_entries ─────────
 CREATE TABLE IF NOT EXISTS mood_entries (
-    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    id           INTEGER PRIMARY KEY,
     user_id      TEXT NOT NULL REFERENCES users(id),
     session_id   TEXT REFERENCES sessions(id),
     mood_score   REAL NOT NULL,
@@ -96,7 +104,7 @@ CREATE TABLE IF NOT EXISTS practice_runs (
 
 -- ───────── practice_run_events ─────────
 CREATE TABLE IF NOT EXISTS practice_run_events (
-    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    id           INTEGER PRIMARY KEY,
     run_id       TEXT NOT NULL REFERENCES practice_runs(id),
     state_from   TEXT NOT NULL,
     state_to     TEXT NOT NULL,
@@ -107,7 +115,7 @@ CREATE TABLE IF NOT EXISTS practice_run_events (
 
 -- ───────── practice_outcomes ─────────
 CREATE TABLE IF NOT EXISTS practice_outcomes (
-    id                 INTEGER PRIMARY KEY AUTOINCREMENT,
+    id                 INTEGER PRIMARY KEY,
     run_id             TEXT NOT NULL REFERENCES practice_runs(id),
     baseline_mood      REAL,
     post_mood          REAL,
@@ -118,7 +126,7 @@ CREATE TABLE IF NOT EXISTS practice_outcomes (
 
 -- ───────── decision_logs ─────────
 CREATE TABLE IF NOT EXISTS decision_logs (
-    id                   INTEGER PRIMARY KEY AUTOINCREMENT,
+    id                   INTEGER PRIMARY KEY,
     session_id           TEXT NOT NULL REFERENCES sessions(id),
     context_state_json   TEXT NOT NULL,
     decision             TEXT NOT NULL,
@@ -129,9 +137,10 @@ CREATE TABLE IF NOT EXISTS decision_logs (
     created_at           TEXT
 );
 
--- ───────── safety_events ─────────
-CREATE TABLE IF NOT EXISTS safety_events (
-    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+-- ───────── coaching_safety_events ─────────
+-- Prefixed so it can share a database file with the v1 protocol safety_events table
+CREATE TABLE IF NOT EXISTS coaching_safety_events (
+    id           INTEGER PRIMARY KEY,
     session_id   TEXT REFERENCES sessions(id),
     detector     TEXT NOT NULL,
     severity     TEXT NOT NULL,
@@ -153,11 +162,13 @@ CREATE INDEX IF NOT EXISTS idx_practice_outcomes_user_practice
 CREATE INDEX IF NOT EXISTS idx_decision_logs_session_created
     ON decision_logs(session_id, created_at DESC);
 
-CREATE INDEX IF NOT EXISTS idx_safety_events_severity_created
-    ON safety_events(severity, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_coaching_safety_events_severity_created
+    ON coaching_safety_events(severity, created_at DESC);
 """
 
 
 async def apply_coaching_schema(db: aiosqlite.Connection) -> None:
     """Apply coaching bot v2 schema. Idempotent (IF NOT EXISTS)."""
-    await db.executescript(COACHING_SCHEMA)
+    await apply_connection_pragmas(db)
+    await apply_schema_script(db, COACHING_SCHEMA)
+    await refresh_planner_stats(db)
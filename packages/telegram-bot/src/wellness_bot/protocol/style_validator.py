@@ -1,12 +1,13 @@
 """Voice + style validator for LLM-generated responses."""
 from __future__ import annotations
 
+import functools
 from dataclasses import dataclass
 
 from wellness_bot.protocol.types import RiskLevel
 
 
-@dataclass
+@dataclass(slots=True)
 class StyleValidationInput:
     text: str
     risk_level: RiskLevel
@@ -18,7 +19,7 @@ class StyleValidationInput:
     max_chars_long: int = 1400
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CheckResult:
     passed: bool
     code: str
@@ -33,50 +34,92 @@ BANNED_SAFETY = [
 SARCASM_MARKERS = ["ну да, конечно", "гениально", "супер идея", "brilliant", "sure, great"]
 EMPATHY_MARKERS = ["понимаю", "это тяжело", "слышу вас", "вижу, что", "you're not alone"]
 CTA_MARKERS = ["хотите", "давайте", "готовы", "оцените", "?"]
+ACTION_MARKERS = ("сделайте", "напишите", "оцените", "выберите", "назовите", "tell me", "rate", "choose")
+
+_HIGH_RISK = frozenset({RiskLevel.CAUTION_ELEVATED, RiskLevel.CRISIS})
+
+# Shared results for the happy path; frozen, so safe to hand out repeatedly
+_PASSED = {
+    code: CheckResult(True, code)
+    for code in (
+        "length", "sentence_limit", "question_limit", "empathy_present", "cta_present",
+        "no_banned_content", "sarcasm_gate", "no_playful_high_risk", "actionable_one_step",
+    )
+}
+
+
+def _check(passed: bool, code: str) -> CheckResult:
+    return _PASSED[code] if passed else CheckResult(False, code)
 
 
 def validate_style(inp: StyleValidationInput) -> list[CheckResult]:
-    t = inp.text.strip().lower()
+    return list(_validate_style(
+        inp.text, inp.risk_level, inp.user_tone_playful, inp.long_form_requested,
+        inp.max_sentences, inp.max_questions, inp.max_chars_short, inp.max_chars_long,
+    ))
+
+
+# Regenerations and speculative candidates often return the same text; the results are
+# immutable, so an identical (text, limits) input can reuse them
+@functools.lru_cache(maxsize=512)
+def _validate_style(
+    text: str,
+    risk_level: RiskLevel,
+    user_tone_playful: bool,
+    long_form_requested: bool,
+    max_sentences: int,
+    max_questions: int,
+    max_chars_short: int,
+    max_chars_long: int,
+) -> tuple[CheckResult, ...]:
+    t = text.strip().lower()
     results = []
 
     # 1) Length
-    max_chars = inp.max_chars_long if inp.long_form_requested else inp.max_chars_short
-    results.append(CheckResult(len(inp.text) <= max_chars, "length"))
+    max_chars = max_chars_long if long_form_requested else max_chars_short
+    results.append(_check(len(text) <= max_chars, "length"))
 
-    # 2) Sentence count
-    sent_count = sum(inp.text.count(x) for x in [".", "!", "?"])
-    results.append(CheckResult(sent_count <= inp.max_sentences, "sentence_limit"))
+    # 2) Sentence count (the "?" tally is shared with the question check)
+    q_count = text.count("?")
+    sent_count = text.count(".") + text.count("!") + q_count
+    results.append(_check(sent_count <= max_sentences, "sentence_limit"))
 
     # 3) Question count
-    q_count = inp.text.count("?")
-    results.append(CheckResult(q_count <= inp.max_questions, "question_limit"))
+    results.append(_check(q_count <= max_questions, "question_limit"))
 
     # 4) Empathy present
-    has_empathy = any(m in t for m in EMPATHY_MARKERS)
-    results.append(CheckResult(has_empathy, "empathy_present"))
+    # Marker scans map the C-level str.__contains__ over each list, no generator frame per marker
+    has_empathy = any(map(t.__contains__, EMPATHY_MARKERS))
+    results.append(_check(has_empathy, "empathy_present"))
 
     # 5) Clear CTA present
-    has_cta = any(m in t for m in CTA_MARKERS)
-    results.append(CheckResult(has_cta, "cta_present"))
+    has_cta = any(map(t.__contains__, CTA_MARKERS))
+    results.append(_check(has_cta, "cta_present"))
 
     # 6) No banned safety content
-    banned_hit = next((b for b in BANNED_SAFETY if b in t), None)
-    results.append(CheckResult(banned_hit is None, "no_banned_content", banned_hit))
+    banned_hit = next(filter(t.__contains__, BANNED_SAFETY), None)
+    results.append(_PASSED["no_banned_content"] if banned_hit is None
+                   else CheckResult(False, "no_banned_content", banned_hit))
 
     # 7) Sarcasm gating
-    has_sarcasm = any(m in t for m in SARCASM_MARKERS)
-    sarcasm_allowed = (inp.risk_level == RiskLevel.SAFE and inp.user_tone_playful)
-    results.append(CheckResult((not has_sarcasm) or sarcasm_allowed, "sarcasm_gate"))
+    has_sarcasm = any(map(t.__contains__, SARCASM_MARKERS))
+    sarcasm_allowed = (risk_level == RiskLevel.SAFE and user_tone_playful)
+    results.append(_check((not has_sarcasm) or sarcasm_allowed, "sarcasm_gate"))
 
     # 8) No playful tone in elevated risk
-    if inp.risk_level in {RiskLevel.CAUTION_ELEVATED, RiskLevel.CRISIS}:
-        results.append(CheckResult(not has_sarcasm, "no_playful_high_risk"))
+    if risk_level in _HIGH_RISK:
+        results.append(_check(not has_sarcasm, "no_playful_high_risk"))
     else:
-        results.append(CheckResult(True, "no_playful_high_risk"))
+        results.append(_PASSED["no_playful_high_risk"])
 
     # 9) One-step actionability (simple heuristic)
-    action_markers = ["сделайте", "напишите", "оцените", "выберите", "назовите", "tell me", "rate", "choose"]
-    action_count = sum(1 for m in action_markers if m in t)
-    results.append(CheckResult(action_count >= 1 and action_count <= 2, "actionable_one_step"))
-
-    return results
+    # Only 1..2 matters, so stop counting at the third marker
+    action_count = 0
+    for m in ACTION_MARKERS:
+        if m in t:
+            action_count += 1
+            if action_count > 2:
+                break
+    results.append(_check(1 <= action_count <= 2, "actionable_one_step"))
+
+    return tuple(results)
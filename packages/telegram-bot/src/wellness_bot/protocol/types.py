@@ -89,7 +89,7 @@ class FallbackType(str, Enum):
     TOO_HARD = "too_hard"
 
 
-@dataclass
+@dataclass(slots=True)
 class SessionContext:
     user_id: int
     session_id: str
@@ -105,7 +105,7 @@ class SessionContext:
     session_number: int = 1
 
 
-@dataclass
+@dataclass(slots=True)
 class LLMContract:
     dialogue_state: str
     generation_task: str
@@ -125,7 +125,7 @@ class LLMContract:
     timer_seconds: int | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class EngineDecision:
     state: DialogueState
     action: str
@@ -138,7 +138,7 @@ class EngineDecision:
     decision_source: Literal["model", "rules", "heuristic"] = "rules"
 
 
-@dataclass
+@dataclass(slots=True)
 class ModuleError:
     module: str
     recoverable: bool
@@ -146,13 +146,13 @@ class ModuleError:
     fallback_response: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class SkippedState:
     state: DialogueState
     reason_code: str
 
 
-@dataclass
+@dataclass(slots=True)
 class StateTransition:
     event_id: str
     transition_seq: int
@@ -209,7 +209,7 @@ class ConsentStatus(str, Enum):
 # ---------------------------------------------------------------------------
 
 
-@dataclass
+@dataclass(slots=True)
 class EmotionalState:
     anxiety: float = 0.0
     rumination: float = 0.0
@@ -220,18 +220,22 @@ class EmotionalState:
 
     @property
     def dominant(self) -> str:
-        fields = {
-            "anxiety": self.anxiety,
-            "rumination": self.rumination,
-            "avoidance": self.avoidance,
-            "perfectionism": self.perfectionism,
-            "self_criticism": self.self_criticism,
-            "symptom_fixation": self.symptom_fixation,
-        }
-        return max(fields, key=fields.get)  # type: ignore[arg-type]
-
-
-@dataclass
+        # Strict > keeps the first field on ties, as max() over the field order did
+        name, best = "anxiety", self.anxiety
+        if self.rumination > best:
+            name, best = "rumination", self.rumination
+        if self.avoidance > best:
+            name, best = "avoidance", self.avoidance
+        if self.perfectionism > best:
+            name, best = "perfectionism", self.perfectionism
+        if self.self_criticism > best:
+            name, best = "self_criticism", self.self_criticism
+        if self.symptom_fixation > best:
+            name = "symptom_fixation"
+        return name
+
+
+@dataclass(slots=True)
 class ContextState:
     risk_level: str
     emotional_state: EmotionalState
@@ -241,7 +245,7 @@ class ContextState:
     candidate_constraints: list[str]
 
 
-@dataclass
+@dataclass(slots=True)
 class OpportunityResult:
     opportunity_score: float
     allow_proactive_suggest: bool
@@ -249,7 +253,7 @@ class OpportunityResult:
     cooldown_until: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class PracticeCandidateRanked:
     practice_id: str
     final_score: float
@@ -259,7 +263,7 @@ class PracticeCandidateRanked:
     alternative_ids: list[str] | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class CoachDecision:
     decision: CoachingDecision
     selected_practice_id: str | None = None
@@ -62,7 +62,8 @@ class CheckInScheduler:
             logger.debug(f"Quiet hours — skipping check-in for {user_id}")
             return
 
-        state = await self.store.get_user_state(user_id)
+        # Fresh read: the admin API may have reset the counter or paused the user
+        state = await self.store.get_user_state(user_id, fresh=True)
 
         # 3-strike rule
         if state["missed_checkins"] >= 3:
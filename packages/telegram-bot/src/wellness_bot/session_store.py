@@ -2,29 +2,146 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
+import logging
+import sqlite3
 import time
+from collections import OrderedDict
+from pathlib import Path
 
 import aiosqlite
 
+logger = logging.getLogger(__name__)
+
+# WAL lets the admin readers run alongside the writer, and synchronous=NORMAL makes a
+# commit a single WAL append instead of journal + database fsyncs
+_CONNECTION_PRAGMAS = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=MEMORY;
+PRAGMA cache_size=-20000;
+PRAGMA mmap_size=268435456;
+PRAGMA busy_timeout=5000;
+"""
+
+# Consecutive failed flushes of one shard before its queued rows are dropped
+_MAX_FLUSH_ATTEMPTS = 5
+
+_INSERT_MESSAGE = "INSERT INTO messages (user_id, role, content, created_at) VALUES (?, ?, ?, ?)"
+_INSERT_MOOD = "INSERT INTO moods (user_id, score, note, created_at) VALUES (?, ?, ?, ?)"
+_INSERT_TOKEN_USAGE = (
+    "INSERT INTO token_usage (user_id, model, input_tokens, output_tokens, created_at) VALUES (?, ?, ?, ?, ?)"
+)
+
+# Keeps user_state.last_message_at current so get_all_users never aggregates messages;
+# creates the row (with table defaults) for users who have never had state written
+_TOUCH_LAST_MESSAGE = """
+    INSERT INTO user_state (user_id, updated_at, last_message_at) VALUES (?, ?, ?)
+    ON CONFLICT(user_id) DO UPDATE SET
+      last_message_at=MAX(COALESCE(user_state.last_message_at, 0), excluded.last_message_at)
+"""
+
+_STATE_COLUMNS = ("status", "checkin_interval", "missed_checkins", "quiet_start", "quiet_end")
+
+
+@functools.lru_cache(maxsize=32)
+def _upsert_state_sql(cols: tuple[str, ...]) -> str:
+    """UPSERT into user_state that sets only *cols* (plus updated_at)."""
+    names = ", ".join(("user_id", *cols, "updated_at"))
+    placeholders = ", ".join("?" * (len(cols) + 2))
+    updates = ", ".join(f"{c}=excluded.{c}" for c in (*cols, "updated_at"))
+    return (
+        f"INSERT INTO user_state ({names}) VALUES ({placeholders}) "
+        f"ON CONFLICT(user_id) DO UPDATE SET {updates}"
+    )
+
 
 class SessionStore:
-    """Persistent storage for conversations, moods, and user state."""
+    """Persistent storage for conversations, moods, and user state.
+
+    With ``shards > 1`` the data is partitioned by ``user_id`` across that many
+    SQLite files (``wellness_0.db`` … next to *db_path*), giving each shard its
+    own writer. Per-user methods touch one shard; global queries merge all.
+    Users map to ``user_id % shards``, so the count is fixed once data exists:
+    changing it routes existing users to empty shards (there is no re-sharding).
 
-    def __init__(self, db_path: str) -> None:
+    Messages, moods and token usage are append-only: writes are queued and a
+    background task commits them in batches every ``flush_interval`` seconds or
+    once ``flush_batch`` rows are pending. Per-user reads flush their user's shard
+    first and global queries flush every shard, so callers always see their own
+    writes; a failed flush is logged and never fails the read.
+
+    ``user_state`` rows are cached in-process for ``state_ttl`` seconds and kept
+    current by this store's own updates; the TTL bounds how long a change made by
+    another process (the admin API pauses and resumes users) can go unseen, and
+    ``get_user_state(fresh=True)`` reads past it.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        shards: int = 1,
+        flush_interval: float = 0.1,
+        flush_batch: int = 64,
+        state_ttl: float = 30.0,
+        state_cache_size: int = 10_000,
+    ) -> None:
         self.db_path = db_path
-        self._db: aiosqlite.Connection | None = None
+        self.shards = shards
+        self.flush_interval = flush_interval
+        self.flush_batch = flush_batch
+        self.state_ttl = state_ttl
+        self.state_cache_size = state_cache_size
+        self._dbs: list[aiosqlite.Connection] = []
+        # Insert SQL -> queued rows (user_id first), written by _writer()
+        self._pending: dict[str, list[tuple]] = {}
+        self._pending_rows = 0
+        # shard index -> consecutive failed flushes, capped by _MAX_FLUSH_ATTEMPTS
+        self._shard_failures: dict[int, int] = {}
+        self._flush_lock = asyncio.Lock()
+        self._buffer_full = asyncio.Event()
+        self._writer_task: asyncio.Task | None = None
+        self._closing = False
+        # user_id -> (loaded_at, state), least recently used first and capped at
+        # state_cache_size. Unlocked: a load racing an update may cache the older
+        # row, which state_ttl bounds like any external write
+        self._state_cache: OrderedDict[int, tuple[float, dict]] = OrderedDict()
+
+    def _shard_paths(self) -> list[str]:
+        if self.shards == 1 or self.db_path == ":memory:":
+            return [self.db_path] * self.shards
+        path = Path(self.db_path)
+        return [str(path.with_name(f"{path.stem}_{i}{path.suffix}")) for i in range(self.shards)]
+
+    def _shard(self, user_id: int | None) -> aiosqlite.Connection:
+        """Return the connection owning *user_id*, raising if not initialized."""
+        assert self._dbs, "SessionStore not initialized — call init() first"
+        return self._dbs[(user_id or 0) % len(self._dbs)]
+
+    async def _all(self, sql: str, params: tuple = ()) -> list:
+        """Run a read query on every shard and concatenate the rows."""
+        assert self._dbs, "SessionStore not initialized — call init() first"
 
-    @property
-    def db(self) -> aiosqlite.Connection:
-        """Return the database connection, raising if not initialized."""
-        assert self._db is not None, "SessionStore not initialized — call init() first"
-        return self._db
+        async def fetch(db: aiosqlite.Connection) -> list:
+            cursor = await db.execute(sql, params)
+            return list(await cursor.fetchall())
+
+        results = await asyncio.gather(*(fetch(db) for db in self._dbs))
+        return [row for rows in results for row in rows]
 
     async def init(self) -> None:
-        self._db = await aiosqlite.connect(self.db_path)
-        await self._db.executescript("""
+        for path in self._shard_paths():
+            db = await aiosqlite.connect(path)
+            await db.executescript(_CONNECTION_PRAGMAS)
+            await self._init_schema(db)
+            self._dbs.append(db)
+        self._writer_task = asyncio.create_task(self._writer())
+
+    async def _init_schema(self, db: aiosqlite.Connection) -> None:
+        await db.executescript("""
             CREATE TABLE IF NOT EXISTS messages (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                id INTEGER PRIMARY KEY,
                 user_id INTEGER NOT NULL,
                 role TEXT NOT NULL,
                 content TEXT NOT NULL,
@@ -33,7 +150,7 @@ class SessionStore:
             CREATE INDEX IF NOT EXISTS idx_messages_user ON messages(user_id, created_at);
 
             CREATE TABLE IF NOT EXISTS moods (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                id INTEGER PRIMARY KEY,
                 user_id INTEGER NOT NULL,
                 score INTEGER NOT NULL,
                 note TEXT DEFAULT '',
@@ -48,11 +165,12 @@ class SessionStore:
                 missed_checkins INTEGER DEFAULT 0,
                 quiet_start INTEGER DEFAULT 23,
                 quiet_end INTEGER DEFAULT 8,
-                updated_at REAL NOT NULL
+                updated_at REAL NOT NULL,
+                last_message_at REAL
             );
 
             CREATE TABLE IF NOT EXISTS token_usage (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                id INTEGER PRIMARY KEY,
                 user_id INTEGER,
                 model TEXT NOT NULL,
                 input_tokens INTEGER NOT NULL,
@@ -61,17 +179,27 @@ class SessionStore:
             );
             CREATE INDEX IF NOT EXISTS idx_tokens_created ON token_usage(created_at);
         """)
-        await self._db.commit()
+        cursor = await db.execute("PRAGMA table_info(user_state)")
+        if "last_message_at" not in {r[1] for r in await cursor.fetchall()}:
+            # Databases created before the column existed: add it and backfill once
+            await db.executescript("""
+                ALTER TABLE user_state ADD COLUMN last_message_at REAL;
+                INSERT INTO user_state (user_id, updated_at, last_message_at)
+                  SELECT user_id, MAX(created_at), MAX(created_at) FROM messages WHERE true GROUP BY user_id
+                ON CONFLICT(user_id) DO UPDATE SET last_message_at=excluded.last_message_at;
+            """)
+        await db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_user_state_last_message ON user_state(last_message_at DESC) "
+            "WHERE last_message_at IS NOT NULL"
+        )
+        await db.commit()
 
     async def save_message(self, user_id: int, role: str, content: str) -> None:
-        await self.db.execute(
-            "INSERT INTO messages (user_id, role, content, created_at) VALUES (?, ?, ?, ?)",
-            (user_id, role, content, time.time()),
-        )
-        await self.db.commit()
+        self._queue(_INSERT_MESSAGE, (user_id, role, content, time.time()))
 
     async def get_messages(self, user_id: int, limit: int = 20) -> list[dict]:
-        cursor = await self.db.execute(
+        await self._flush_for_read(user_id)
+        cursor = await self._shard(user_id).execute(
             "SELECT role, content, created_at FROM messages WHERE user_id = ? ORDER BY created_at ASC LIMIT ?",
             (user_id, limit),
         )
@@ -79,103 +207,246 @@ class SessionStore:
         return [{"role": r[0], "content": r[1], "created_at": r[2]} for r in rows]
 
     async def save_mood(self, user_id: int, score: int, note: str = "") -> None:
-        await self.db.execute(
-            "INSERT INTO moods (user_id, score, note, created_at) VALUES (?, ?, ?, ?)",
-            (user_id, score, note, time.time()),
-        )
-        await self.db.commit()
+        self._queue(_INSERT_MOOD, (user_id, score, note, time.time()))
 
     async def get_moods(self, user_id: int, limit: int = 10) -> list[dict]:
-        cursor = await self.db.execute(
+        await self._flush_for_read(user_id)
+        cursor = await self._shard(user_id).execute(
             "SELECT score, note, created_at FROM moods WHERE user_id = ? ORDER BY created_at DESC LIMIT ?",
             (user_id, limit),
         )
         rows = await cursor.fetchall()
         return [{"score": r[0], "note": r[1], "created_at": r[2]} for r in rows]
 
-    async def get_user_state(self, user_id: int) -> dict:
-        cursor = await self.db.execute(
+    async def get_user_state(self, user_id: int, fresh: bool = False) -> dict:
+        """Return the user's state; *fresh* skips the cache (e.g. to honour admin edits)."""
+        cached = None if fresh else self._state_cache.get(user_id)
+        if cached is not None and time.monotonic() - cached[0] < self.state_ttl:
+            self._state_cache.move_to_end(user_id)
+            return dict(cached[1])
+        cursor = await self._shard(user_id).execute(
             "SELECT status, checkin_interval, missed_checkins, quiet_start, quiet_end FROM user_state WHERE user_id = ?",
             (user_id,),
         )
         row = await cursor.fetchone()
         if row is None:
-            return {"status": "onboarding", "checkin_interval": 4.0, "missed_checkins": 0, "quiet_start": 23, "quiet_end": 8}
-        return {"status": row[0], "checkin_interval": row[1], "missed_checkins": row[2], "quiet_start": row[3], "quiet_end": row[4]}
+            state = {"status": "onboarding", "checkin_interval": 4.0, "missed_checkins": 0, "quiet_start": 23, "quiet_end": 8}
+        else:
+            state = {"status": row[0], "checkin_interval": row[1], "missed_checkins": row[2], "quiet_start": row[3], "quiet_end": row[4]}
+        self._state_cache[user_id] = (time.monotonic(), state)
+        self._state_cache.move_to_end(user_id)
+        if len(self._state_cache) > self.state_cache_size:
+            self._state_cache.popitem(last=False)
+        return dict(state)
 
     async def update_user_state(self, user_id: int, **kwargs) -> None:
-        existing = await self.get_user_state(user_id)
-        merged = {**existing, **kwargs}
-        await self.db.execute(
-            """INSERT INTO user_state (user_id, status, checkin_interval, missed_checkins, quiet_start, quiet_end, updated_at)
-               VALUES (?, ?, ?, ?, ?, ?, ?)
-               ON CONFLICT(user_id) DO UPDATE SET
-                 status=excluded.status, checkin_interval=excluded.checkin_interval,
-                 missed_checkins=excluded.missed_checkins, quiet_start=excluded.quiet_start,
-                 quiet_end=excluded.quiet_end, updated_at=excluded.updated_at""",
-            (user_id, merged["status"], merged["checkin_interval"], merged["missed_checkins"],
-             merged["quiet_start"], merged["quiet_end"], time.time()),
+        # Only the passed columns are written, so the merge with the stored row
+        # happens inside the UPSERT; a new row takes the table defaults for the rest
+        cols = tuple(c for c in _STATE_COLUMNS if c in kwargs)
+        db = self._shard(user_id)
+        await db.execute(
+            _upsert_state_sql(cols),
+            (user_id, *(kwargs[c] for c in cols), time.time()),
         )
-        await self.db.commit()
+        await db.commit()
+        # Write through when the row is cached; otherwise the next read loads it
+        cached = self._state_cache.get(user_id)
+        if cached is not None:
+            cached[1].update((c, kwargs[c]) for c in cols)
 
     async def increment_missed_checkins(self, user_id: int) -> None:
-        state = await self.get_user_state(user_id)
-        await self.update_user_state(user_id, missed_checkins=state["missed_checkins"] + 1)
+        db = self._shard(user_id)
+        await db.execute(
+            """INSERT INTO user_state (user_id, missed_checkins, updated_at) VALUES (?, 1, ?)
+               ON CONFLICT(user_id) DO UPDATE SET
+                 missed_checkins=user_state.missed_checkins + 1, updated_at=excluded.updated_at""",
+            (user_id, time.time()),
+        )
+        await db.commit()
+        cached = self._state_cache.get(user_id)
+        if cached is not None:
+            cached[1]["missed_checkins"] += 1
 
     async def reset_missed_checkins(self, user_id: int) -> None:
         await self.update_user_state(user_id, missed_checkins=0)
 
     async def save_token_usage(self, user_id: int, model: str, input_tokens: int, output_tokens: int) -> None:
-        await self.db.execute(
-            "INSERT INTO token_usage (user_id, model, input_tokens, output_tokens, created_at) VALUES (?, ?, ?, ?, ?)",
-            (user_id, model, input_tokens, output_tokens, time.time()),
-        )
-        await self.db.commit()
+        self.log_token_usage(user_id, model, input_tokens, output_tokens)
+
+    def log_token_usage(self, user_id: int, model: str, input_tokens: int, output_tokens: int) -> None:
+        """Queue a token usage row without awaiting (for fire-and-forget callers)."""
+        self._queue(_INSERT_TOKEN_USAGE, (user_id, model, input_tokens, output_tokens, time.time()))
+
+    def _queue(self, sql: str, row: tuple) -> None:
+        self._pending.setdefault(sql, []).append(row)
+        self._pending_rows += 1
+        if self._pending_rows >= self.flush_batch:
+            self._buffer_full.set()
+
+    async def flush(self, user_id: int | None = None) -> None:
+        """Write queued rows now: one transaction per shard.
+
+        With *user_id*, only the shard owning that user is written. A row the
+        schema rejects is logged and dropped; after any other failure the shard's
+        rows are re-queued and the error re-raised, up to ``_MAX_FLUSH_ATTEMPTS``
+        consecutive failures, after which they are dropped too.
+        """
+        async with self._flush_lock:
+            count = len(self._dbs)
+            only = None if user_id is None else user_id % count
+            by_shard: dict[int, dict[str, list[tuple]]] = {}
+            kept: dict[str, list[tuple]] = {}
+            for sql, rows in self._pending.items():
+                for row in rows:
+                    idx = (row[0] or 0) % count
+                    if only is not None and idx != only:
+                        kept.setdefault(sql, []).append(row)
+                    else:
+                        by_shard.setdefault(idx, {}).setdefault(sql, []).append(row)
+            if not by_shard:
+                return
+            self._pending = kept
+            self._pending_rows = sum(len(rows) for rows in kept.values())
+
+            failed: dict[str, list[tuple]] = {}
+            error: Exception | None = None
+            for idx, statements in by_shard.items():
+                db = self._dbs[idx]
+                try:
+                    try:
+                        await self._write_shard(idx, statements)
+                    except sqlite3.IntegrityError:
+                        # Some row will never go in; retry row by row and drop the offenders
+                        await db.rollback()
+                        await self._write_shard(idx, statements, row_by_row=True)
+                    self._shard_failures.pop(idx, None)
+                except Exception as e:
+                    await db.rollback()
+                    error = error or e
+                    rows_count = sum(len(rows) for rows in statements.values())
+                    attempts = self._shard_failures.get(idx, 0) + 1
+                    if attempts >= _MAX_FLUSH_ATTEMPTS:
+                        logger.exception(
+                            "Flush to shard %d failed %d times in a row; dropped %d rows", idx, attempts, rows_count,
+                        )
+                        self._shard_failures.pop(idx, None)
+                        continue
+                    logger.exception("Flush to shard %d failed; re-queued %d rows", idx, rows_count)
+                    self._shard_failures[idx] = attempts
+                    for sql, rows in statements.items():
+                        failed.setdefault(sql, []).extend(rows)
+            # Ahead of anything queued while this flush was running, keeping insert order
+            for sql, rows in failed.items():
+                self._pending[sql] = rows + self._pending.get(sql, [])
+                self._pending_rows += len(rows)
+            if error is not None:
+                raise error
+
+    async def _write_shard(self, idx: int, statements: dict[str, list[tuple]], row_by_row: bool = False) -> None:
+        db = self._dbs[idx]
+        messages = statements.get(_INSERT_MESSAGE, [])
+        for sql, rows in statements.items():
+            if not row_by_row:
+                await db.executemany(sql, rows)
+                continue
+            written = []
+            for row in rows:
+                try:
+                    await db.execute(sql, row)
+                except sqlite3.IntegrityError:
+                    logger.error("Dropped row rejected by shard %d: %s %r", idx, sql.split("(")[0].strip(), row)
+                else:
+                    written.append(row)
+            if sql == _INSERT_MESSAGE:
+                messages = written
+        if messages:
+            last: dict[int, float] = {}
+            for user_id, _, _, created_at in messages:
+                last[user_id] = max(created_at, last.get(user_id, 0.0))
+            await db.executemany(_TOUCH_LAST_MESSAGE, [(u, t, t) for u, t in last.items()])
+        await db.commit()
+
+    async def _flush_for_read(self, user_id: int | None = None) -> None:
+        """Flush ahead of a read; a failed write (already logged) must not fail the read."""
+        try:
+            await self.flush(user_id)
+        except Exception:
+            pass
+
+    async def flush_token_usage(self) -> None:
+        """Write all queued rows now (kept for callers predating message/mood batching)."""
+        await self.flush()
+
+    async def _writer(self) -> None:
+        """Flush queued rows every ``flush_interval`` or once ``flush_batch`` rows are queued."""
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._buffer_full.wait(), self.flush_interval)
+            except TimeoutError:
+                pass
+            self._buffer_full.clear()
+            try:
+                await self.flush()
+            except Exception:
+                # flush() already logged and re-queued the rows; retry on the next tick
+                pass
 
     async def get_token_usage(self, days: int = 30) -> list[dict]:
+        await self._flush_for_read()
         since = time.time() - days * 86400
-        cursor = await self.db.execute(
+        rows = await self._all(
             "SELECT user_id, model, input_tokens, output_tokens, created_at FROM token_usage WHERE created_at >= ? ORDER BY created_at DESC",
             (since,),
         )
-        rows = await cursor.fetchall()
+        if len(self._dbs) > 1:
+            rows.sort(key=lambda r: r[4], reverse=True)
         return [{"user_id": r[0], "model": r[1], "input_tokens": r[2], "output_tokens": r[3], "created_at": r[4]} for r in rows]
 
     async def get_token_summary(self) -> dict:
+        await self._flush_for_read()
         now = time.time()
         result: dict = {}
         for label, since in [("today", now - 86400), ("week", now - 7 * 86400), ("month", now - 30 * 86400)]:
-            cursor = await self.db.execute(
+            # COALESCE aggregate: exactly one row per shard
+            rows = await self._all(
                 "SELECT COALESCE(SUM(input_tokens), 0), COALESCE(SUM(output_tokens), 0) FROM token_usage WHERE created_at >= ?",
                 (since,),
             )
-            row = await cursor.fetchone()
-            assert row is not None, "COALESCE query always returns a row"
-            result[label] = {"input_tokens": row[0], "output_tokens": row[1]}
+            result[label] = {"input_tokens": sum(r[0] for r in rows), "output_tokens": sum(r[1] for r in rows)}
         return result
 
     async def get_all_users(self) -> list[dict]:
-        cursor = await self.db.execute("""
-            SELECT DISTINCT m.user_id,
-                   COALESCE(us.status, 'onboarding') as status,
-                   COALESCE(us.missed_checkins, 0) as missed_checkins,
-                   MAX(m.created_at) as last_message_at
-            FROM messages m
-            LEFT JOIN user_state us ON m.user_id = us.user_id
-            GROUP BY m.user_id
+        await self._flush_for_read()
+        rows = await self._all("""
+            SELECT user_id, status, missed_checkins, last_message_at
+            FROM user_state
+            WHERE last_message_at IS NOT NULL
             ORDER BY last_message_at DESC
         """)
-        rows = await cursor.fetchall()
+        if len(self._dbs) > 1:
+            rows.sort(key=lambda r: r[3], reverse=True)
         return [{"user_id": r[0], "status": r[1], "missed_checkins": r[2], "last_message_at": r[3]} for r in rows]
 
     async def get_recent_messages(self, limit: int = 10) -> list[dict]:
-        cursor = await self.db.execute(
+        await self._flush_for_read()
+        rows = await self._all(
             "SELECT user_id, role, content, created_at FROM messages ORDER BY created_at DESC LIMIT ?",
             (limit,),
         )
-        rows = await cursor.fetchall()
+        if len(self._dbs) > 1:
+            rows = sorted(rows, key=lambda r: r[3], reverse=True)[:limit]
         return [{"user_id": r[0], "role": r[1], "content": r[2], "created_at": r[3]} for r in rows]
 
     async def close(self) -> None:
-        if self._db:
-            await self._db.close()
+        try:
+            if self._writer_task is not None:
+                self._closing = True
+                self._buffer_full.set()
+                await self._writer_task
+                self._writer_task = None
+            if self._dbs:
+                await self.flush()
+        finally:
+            for db in self._dbs:
+                await db.close()
+            self._dbs.clear()
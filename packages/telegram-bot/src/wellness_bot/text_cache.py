@@ -0,0 +1,25 @@
+"""Memoization for pure functions of short message text."""
+
+from __future__ import annotations
+
+import functools
+from collections.abc import Callable
+from typing import TypeVar
+
+_R = TypeVar("_R")
+
+
+def cached_short(fn: Callable[[str], _R], max_len: int = 64, maxsize: int = 4096) -> Callable[[str], _R]:
+    """Wrap *fn* so texts up to *max_len* chars are served from an LRU cache.
+
+    Short replies ("ок", "да", "дальше") repeat constantly across turns; long
+    messages rarely do and aren't worth holding in memory, so they bypass the
+    cache. *fn* must be pure and its results must not be mutated by callers.
+    """
+    cached = functools.lru_cache(maxsize=maxsize)(fn)
+
+    @functools.wraps(fn)
+    def wrapper(text: str) -> _R:
+        return cached(text) if len(text) <= max_len else fn(text)
+
+    return wrapper
@@ -123,7 +123,7 @@ class TestLogSafetyEvent:
             message_hash="abc123",
         )
 
-        cursor = await db.execute("SELECT * FROM safety_events")
+        cursor = await db.execute("SELECT * FROM coaching_safety_events")
         rows = await cursor.fetchall()
         assert len(rows) == 1
 
@@ -144,7 +144,7 @@ class TestLogSafetyEvent:
         )
 
         cursor = await db.execute(
-            "SELECT message_hash FROM safety_events"
+            "SELECT message_hash FROM coaching_safety_events"
         )
         row = await cursor.fetchone()
         assert row["message_hash"] is None
@@ -159,7 +159,7 @@ class TestLogSafetyEvent:
                 action="pass",
             )
 
-        cursor = await db.execute("SELECT COUNT(*) FROM safety_events")
+        cursor = await db.execute("SELECT COUNT(*) FROM coaching_safety_events")
         row = await cursor.fetchone()
         assert row[0] == 4
 
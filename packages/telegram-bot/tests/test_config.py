@@ -1,5 +1,8 @@
 """Tests for bot configuration."""
 
+import pytest
+from pydantic import ValidationError
+
 from wellness_bot.config import BotConfig
 
 
@@ -31,3 +34,12 @@ class TestBotConfig:
         monkeypatch.setenv("ELEVENLABS_API_KEY", "el-test")
         config = BotConfig()
         assert config.allowed_ids == set()
+
+    def test_db_shards_other_than_one_rejected(self, monkeypatch):
+        monkeypatch.setenv("TELEGRAM_BOT_TOKEN", "123:ABC")
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-ant-test")
+        monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+        monkeypatch.setenv("ELEVENLABS_API_KEY", "el-test")
+        monkeypatch.setenv("DB_SHARDS", "4")
+        with pytest.raises(ValidationError, match="db_shards"):
+            BotConfig()
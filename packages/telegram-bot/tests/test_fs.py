@@ -0,0 +1,24 @@
+"""Tests for filesystem helpers."""
+
+from unittest.mock import patch
+
+import pytest
+
+from wellness_bot.fs import atomic_write
+
+
+class TestAtomicWrite:
+
+    def test_writes_and_creates_parent(self, tmp_path):
+        path = tmp_path / "nested" / "out.bin"
+        atomic_write(path, b"data")
+        assert path.read_bytes() == b"data"
+
+    def test_failed_replace_keeps_old_file_and_removes_temp(self, tmp_path):
+        path = tmp_path / "out.bin"
+        path.write_bytes(b"old")
+        with patch("wellness_bot.fs.os.replace", side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                atomic_write(path, b"new")
+        assert path.read_bytes() == b"old"
+        assert [p.name for p in tmp_path.iterdir()] == ["out.bin"]
@@ -4,6 +4,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from wellness_bot.coaching.pipeline import SAFE_FALLBACKS
 from wellness_bot.config import BotConfig
 from wellness_bot.handlers import WellnessBot
 
@@ -22,6 +23,8 @@ class TestWellnessBot:
         bot = WellnessBot(config)
         assert bot.config == config
         assert bot.store is None  # not yet initialized
+        with pytest.raises(RuntimeError, match="not initialized"):
+            bot._require_setup()
 
     async def test_setup_initializes_components(self, config):
         bot = WellnessBot(config)
@@ -79,3 +82,61 @@ class TestWellnessBot:
         assert msgs[0]["role"] == "user"
         assert msgs[1]["role"] == "assistant"
         await bot.shutdown()
+
+    async def test_process_text_sends_current_message_once(self, config):
+        bot = WellnessBot(config)
+        with patch("wellness_bot.handlers.Composer") as MockComposer:
+            MockComposer.return_value.load.return_value = MagicMock()
+            await bot.setup()
+        bot.agent_runtime._build_system_prompt = MagicMock(return_value="system")
+
+        mock_response = MagicMock()
+        mock_response.content = "Reply"
+        mock_response.model = "claude-sonnet-4-5-20250929"
+        mock_response.usage = None
+        bot.provider.chat = AsyncMock(return_value=mock_response)
+
+        await bot.process_text(user_id=1, text="First")
+        await bot.process_text(user_id=1, text="Second")
+
+        sent = bot.provider.chat.call_args.kwargs["messages"]
+        assert [m.content for m in sent] == ["First", "Reply", "Second"]
+        assert len(await bot.store.get_messages(1)) == 4
+        await bot.shutdown()
+
+    async def test_tts_cached_reuses_audio_from_disk(self, config, tmp_path):
+        config.tts_cache_dir = str(tmp_path / "tts")
+        bot = WellnessBot(config)
+        mock_config = MagicMock()
+        with patch("wellness_bot.handlers.Composer") as MockComposer:
+            MockComposer.return_value.load.return_value = mock_config
+            await bot.setup()
+
+        bot.voice.text_to_speech = AsyncMock(return_value=b"mp3-bytes")
+
+        first = await bot.text_to_speech(SAFE_FALLBACKS["ru"])
+        second = await bot.text_to_speech(SAFE_FALLBACKS["ru"])
+
+        assert first == second == b"mp3-bytes"
+        bot.voice.text_to_speech.assert_awaited_once()
+        assert len(list((tmp_path / "tts").glob("*.mp3"))) == 1
+
+        # Free-form replies are not cached
+        await bot.text_to_speech("Unique LLM reply")
+        assert bot.voice.text_to_speech.await_count == 2
+        assert len(list((tmp_path / "tts").glob("*.mp3"))) == 1
+        await bot.shutdown()
+
+    async def test_failed_tts_cache_write_leaves_no_temp_file(self, config, tmp_path):
+        config.tts_cache_dir = str(tmp_path / "tts")
+        bot = WellnessBot(config)
+        with patch("wellness_bot.handlers.Composer") as MockComposer:
+            MockComposer.return_value.load.return_value = MagicMock()
+            await bot.setup()
+
+        bot.voice.text_to_speech = AsyncMock(return_value=b"mp3-bytes")
+        with patch("wellness_bot.fs.os.replace", side_effect=OSError("disk full")):
+            assert await bot.text_to_speech(SAFE_FALLBACKS["ru"]) == b"mp3-bytes"
+
+        assert list((tmp_path / "tts").iterdir()) == []
+        await bot.shutdown()
@@ -1,15 +1,19 @@
 # tests/test_llm_adapter.py
 """Tests for LLMAdapter — contract-bound generation with validation."""
+import asyncio
+
 import pytest
 from dataclasses import dataclass, field
 from unittest.mock import AsyncMock
 
 from wellness_bot.protocol.types import LLMContract, RiskLevel
 from wellness_bot.protocol.llm_adapter import (
+    _count_scripts,
     LLMAdapter,
     ResponseValidator,
     CircuitBreaker,
     STATE_FALLBACKS,
+    STYLE_SYSTEM_PROMPT,
     DEFAULT_FALLBACK,
 )
 from wellness_bot.protocol.style_validator import (
@@ -90,6 +94,86 @@ class TestGeneratesValidResponse:
         mock_llm.chat.assert_called_once()
 
 
+class TestPromptCaching:
+    async def test_style_layer_sent_as_cached_system_block(self, adapter, mock_llm):
+        mock_llm.chat.return_value = MockLLMResponse(content=GOOD_RESPONSE)
+        await adapter.generate(_make_contract(), RiskLevel.SAFE)
+
+        system = mock_llm.chat.call_args.kwargs["system"]
+        assert system[0]["text"] == STYLE_SYSTEM_PROMPT
+        assert system[0]["cache_control"] == {"type": "ephemeral"}
+        assert "[GENERATION TASK]" in system[1]["text"]
+        assert "cache_control" not in system[1]
+
+
+class TestResponseCache:
+    async def test_validated_response_reused_without_llm_call(self, adapter, mock_llm):
+        mock_llm.chat.return_value = MockLLMResponse(content=GOOD_RESPONSE)
+        first = await adapter.generate(_make_contract(), RiskLevel.SAFE)
+        second = await adapter.generate(_make_contract(), RiskLevel.SAFE)
+
+        assert first == second == GOOD_RESPONSE
+        assert mock_llm.chat.await_count == 1
+
+    async def test_different_context_misses_cache(self, adapter, mock_llm):
+        mock_llm.chat.return_value = MockLLMResponse(content=GOOD_RESPONSE)
+        await adapter.generate(_make_contract(), RiskLevel.SAFE)
+        await adapter.generate(_make_contract(user_response_to="\u0414\u0430"), RiskLevel.SAFE)
+        await adapter.generate(_make_contract(), RiskLevel.CAUTION_MILD)
+
+        assert mock_llm.chat.await_count == 3
+
+    async def test_fallbacks_are_not_cached(self, adapter, mock_llm):
+        mock_llm.chat.return_value = MockLLMResponse(content="\u0423 \u0432\u0430\u0441 \u0434\u0435\u043f\u0440\u0435\u0441\u0441\u0438\u044f.")
+        await adapter.generate(_make_contract(), RiskLevel.SAFE)
+        mock_llm.chat.return_value = MockLLMResponse(content=GOOD_RESPONSE)
+        result = await adapter.generate(_make_contract(), RiskLevel.SAFE)
+
+        assert result == GOOD_RESPONSE
+        assert mock_llm.chat.await_count == 2
+
+
+class TestSpeculativeGeneration:
+    async def test_first_passing_candidate_wins_and_rest_cancelled(self, mock_llm):
+        cancelled = asyncio.Event()
+
+        async def chat(**kwargs):
+            if mock_llm.chat.await_count == 1:
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.set()
+                    raise
+            return MockLLMResponse(content=GOOD_RESPONSE)
+
+        mock_llm.chat.side_effect = chat
+        adapter = LLMAdapter(llm_provider=mock_llm, speculative=2)
+        result = await asyncio.wait_for(adapter.generate(_make_contract(), RiskLevel.SAFE), 1)
+        await asyncio.sleep(0)
+
+        assert result == GOOD_RESPONSE
+        assert mock_llm.chat.await_count == 2
+        assert cancelled.is_set()
+
+    async def test_critical_candidate_discarded_when_another_passes(self, mock_llm):
+        mock_llm.chat.side_effect = [
+            MockLLMResponse(content="\u0423 \u0432\u0430\u0441 \u0434\u0435\u043f\u0440\u0435\u0441\u0441\u0438\u044f."),
+            MockLLMResponse(content=GOOD_RESPONSE),
+        ]
+        adapter = LLMAdapter(llm_provider=mock_llm, speculative=2)
+        result = await adapter.generate(_make_contract(), RiskLevel.SAFE)
+
+        assert result == GOOD_RESPONSE
+
+    async def test_failed_speculative_attempt_counts_once_toward_breaker(self, mock_llm):
+        mock_llm.chat.side_effect = RuntimeError("LLM down")
+        adapter = LLMAdapter(llm_provider=mock_llm, max_repeat_count=1, speculative=3)
+        await adapter.generate(_make_contract(), RiskLevel.SAFE)
+
+        assert mock_llm.chat.await_count == 3
+        assert len(adapter._breaker._failures) == 1
+
+
 class TestCircuitBreakerTriggers:
     async def test_circuit_breaker_triggers(self, mock_llm):
         """After 3 failures within window, adapter returns state fallback."""
@@ -209,6 +293,20 @@ class TestFallbackPerState:
         result = await adapter.generate(contract, risk_level=RiskLevel.SAFE)
         assert result == DEFAULT_FALLBACK
 
+    async def test_enum_state_resolves_to_same_fallback(self, mock_llm):
+        from wellness_bot.protocol.types import DialogueState
+
+        mock_llm.chat.side_effect = RuntimeError("down")
+        adapter = LLMAdapter(llm_provider=mock_llm, max_repeat_count=1)
+        contract = _make_contract(dialogue_state=DialogueState.PRACTICE)
+
+        result = await adapter.generate(contract, risk_level=RiskLevel.SAFE)
+        assert result == STATE_FALLBACKS["PRACTICE"]
+
+    def test_non_string_state_gets_default_fallback(self, mock_llm):
+        adapter = LLMAdapter(llm_provider=mock_llm)
+        assert adapter._get_fallback(None) == DEFAULT_FALLBACK
+
 
 # ---------------------------------------------------------------------------
 # Unit tests for ResponseValidator alone
@@ -222,6 +320,12 @@ class TestResponseValidator:
         results = validator.validate(GOOD_RESPONSE, contract)
         assert all(r.passed for r in results), [r for r in results if not r.passed]
 
+    def test_passing_results_are_shared_singletons(self):
+        validator = ResponseValidator()
+        first = validator.validate(GOOD_RESPONSE, _make_contract())
+        second = validator.validate(GOOD_RESPONSE, _make_contract())
+        assert all(a is b for a, b in zip(first, second))
+
     def test_length_check_fails(self):
         validator = ResponseValidator()
         contract = _make_contract(max_chars_per_message=10)
@@ -261,6 +365,19 @@ class TestResponseValidator:
         assert not sl.passed
         assert sl.critical
 
+    def test_validate_critical_returns_first_hit(self):
+        validator = ResponseValidator()
+        assert validator.validate_critical(GOOD_RESPONSE) is None
+        text = "\u0423 \u0432\u0430\u0441 \u0434\u0435\u043f\u0440\u0435\u0441\u0441\u0438\u044f."
+        hit = validator.validate_critical(text)
+        assert hit is not None and hit.code == "no_diagnosis" and hit.critical
+
+    def test_validate_contract_skips_critical_checks(self):
+        validator = ResponseValidator()
+        codes = {r.code for r in validator.validate_contract(GOOD_RESPONSE, _make_contract())}
+        assert codes.isdisjoint({"no_diagnosis", "no_medication", "safety_lexicon"})
+        assert len(codes) == 6
+
     def test_language_match_english_in_ru_contract(self):
         validator = ResponseValidator()
         contract = _make_contract(language="ru")
@@ -269,6 +386,21 @@ class TestResponseValidator:
         lang = next(r for r in results if r.code == "language_match")
         assert not lang.passed
 
+    def test_language_match_ru_passes_for_mixed_text(self):
+        validator = ResponseValidator()
+        contract = _make_contract(language="ru")
+        # 9 Cyrillic letters out of 12; digits/punctuation ignored
+        text = "\u041f\u0440\u0438\u0432\u0435\u0442, CBT 4 \u0432\u0430\u0441!"
+        results = validator.validate(text, contract)
+        lang = next(r for r in results if r.code == "language_match")
+        assert lang.passed
+
+    def test_count_scripts_matches_per_char_definition(self):
+        # Cyrillic signs (U+0482) are not letters; U+0130 and the Kelvin sign lowercase into a-z
+        text = "\u0416\u0436\u0482 Ab \u0130\u212a \u00e9 42"
+        assert _count_scripts(text) == (7, 2, 4)
+        assert _count_scripts("123 ...") == (0, 0, 0)
+
 
 # ---------------------------------------------------------------------------
 # Unit tests for CircuitBreaker
@@ -296,6 +428,16 @@ class TestCircuitBreaker:
         cb.reset()
         assert not cb.is_open()
 
+    def test_failures_expire_after_window(self, monkeypatch):
+        clock = iter([0.0, 1.0, 2.0, 30.0, 61.5])
+        monkeypatch.setattr("wellness_bot.protocol.llm_adapter.time.monotonic", lambda: next(clock))
+        cb = CircuitBreaker(threshold=3, window_seconds=60.0)
+        for _ in range(3):
+            cb.record_failure()
+        assert cb.is_open()
+        # At t=61.5 the failures at 0.0 and 1.0 have aged out
+        assert not cb.is_open()
+
 
 # ---------------------------------------------------------------------------
 # Unit tests for StyleValidator
@@ -346,3 +488,26 @@ class TestStyleValidator:
         results = validate_style(inp)
         sarcasm = next(r for r in results if r.code == "sarcasm_gate")
         assert sarcasm.passed
+
+    def test_repeat_text_returns_fresh_list(self):
+        inp = StyleValidationInput(
+            text=GOOD_RESPONSE,
+            risk_level=RiskLevel.SAFE,
+            user_tone_playful=False,
+            long_form_requested=False,
+        )
+        first = validate_style(inp)
+        first.clear()
+        assert len(validate_style(inp)) == 9
+
+    def test_passing_checks_are_shared_singletons(self):
+        from wellness_bot.protocol import style_validator
+
+        inp = StyleValidationInput(
+            text=GOOD_RESPONSE + " ",
+            risk_level=RiskLevel.SAFE,
+            user_tone_playful=False,
+            long_form_requested=False,
+        )
+        for r in validate_style(inp):
+            assert r is style_validator._PASSED[r.code]
@@ -110,6 +110,52 @@ class TestPracticeLoader:
         step3 = practices["U2"].steps[2]
         assert step3.buttons[0]["action"] == "next"
 
+    def test_no_sidecar_without_cache_dir(self, valid_yaml):
+        PracticeLoader(practices_dir=valid_yaml).load_all()
+        assert sorted(p.name for p in valid_yaml.iterdir()) == ["U2-grounding.yaml"]
+
+    def test_second_load_served_from_sidecar(self, valid_yaml, tmp_path_factory, monkeypatch):
+        cache_dir = tmp_path_factory.mktemp("cache")
+        first = PracticeLoader(practices_dir=valid_yaml, cache_dir=cache_dir).load_all()
+        assert len(list(cache_dir.glob("practices-*.json"))) == 1
+
+        loader = PracticeLoader(practices_dir=valid_yaml, cache_dir=cache_dir)
+        monkeypatch.setattr(loader, "_load_one", lambda path: pytest.fail("YAML re-parsed"))
+        assert loader.load_all() == first
+
+    def test_repeat_load_returns_same_practice_objects(self, valid_yaml, monkeypatch):
+        loader = PracticeLoader(practices_dir=valid_yaml)
+        first = loader.load_all()
+        monkeypatch.setattr(loader, "_read_cache", lambda stamps: pytest.fail("cache re-read"))
+        second = loader.load_all()
+        assert second["U2"] is first["U2"]
+
+    def test_new_yaml_file_picked_up(self, valid_yaml):
+        loader = PracticeLoader(practices_dir=valid_yaml)
+        loader.load_all()
+        text = (valid_yaml / "U2-grounding.yaml").read_text()
+        (valid_yaml / "U3-copy.yaml").write_text(text.replace("id: U2", "id: U3"))
+
+        assert set(loader.load_all()) == {"U2", "U3"}
+
+    def test_sidecar_invalidated_when_yaml_changes(self, valid_yaml, tmp_path_factory):
+        cache_dir = tmp_path_factory.mktemp("cache")
+        PracticeLoader(practices_dir=valid_yaml, cache_dir=cache_dir).load_all()
+        path = valid_yaml / "U2-grounding.yaml"
+        path.write_text(path.read_text().replace("3-3-3 заземление", "Заземление"))
+
+        practices = PracticeLoader(practices_dir=valid_yaml, cache_dir=cache_dir).load_all()
+        assert practices["U2"].name_ru == "Заземление"
+
+    def test_non_json_keys_not_cached(self, valid_yaml, tmp_path_factory):
+        cache_dir = tmp_path_factory.mktemp("cache")
+        path = valid_yaml / "U2-grounding.yaml"
+        path.write_text(path.read_text().replace("outcome:\n", "outcome:\n  1: first\n", 1))
+
+        practices = PracticeLoader(practices_dir=valid_yaml, cache_dir=cache_dir).load_all()
+        assert practices["U2"].outcome[1] == "first"
+        assert list(cache_dir.iterdir()) == []
+
     def test_missing_fallback_key_fails(self, tmp_path):
         bad = """
 id: BAD
@@ -173,3 +219,9 @@ resume_compatibility: {practice_id: GAP, version: "1.0", step_schema_hash: "sha2
         loader = PracticeLoader(practices_dir=tmp_path)
         with pytest.raises(PracticeValidationError, match="continuity"):
             loader.load_all()
+
+    def test_missing_required_key_fails(self, tmp_path):
+        (tmp_path / "NOV-test.yaml").write_text("id: NOV\ncategory: micro\nsteps: []\n")
+        loader = PracticeLoader(practices_dir=tmp_path)
+        with pytest.raises(PracticeValidationError, match="missing required key 'version'"):
+            loader.load_all()
@@ -5,7 +5,7 @@ import aiosqlite
 from datetime import datetime, timezone
 
 from wellness_bot.protocol.schema import apply_protocol_schema
-from wellness_bot.protocol.repository import SQLiteUnitOfWork
+from wellness_bot.protocol.repository import SQLiteUnitOfWork, _utc_now_iso
 
 
 @pytest.fixture
@@ -91,6 +91,16 @@ class TestSQLiteUnitOfWork:
         assert a2["times_used"] == 2
         assert a2["avg_effectiveness"] == 4.0  # (3+5)/2
 
+    async def test_readonly_does_not_take_write_lock(self, db, tmp_path):
+        other = await aiosqlite.connect(str(tmp_path / "test.db"), timeout=0.1)
+        try:
+            async with SQLiteUnitOfWork(db, readonly=True):
+                # A second writer can still begin immediately
+                await other.execute("BEGIN IMMEDIATE")
+                await other.rollback()
+        finally:
+            await other.close()
+
     async def test_rollback_on_error(self, db):
         now = datetime.now(timezone.utc).isoformat()
         try:
@@ -106,3 +116,11 @@ class TestSQLiteUnitOfWork:
         async with SQLiteUnitOfWork(db) as uow:
             session = await uow.sessions.get_active(user_id=1)
         assert session is None  # rolled back
+
+
+def test_utc_now_iso_matches_datetime_layout():
+    stamp = _utc_now_iso()
+    parsed = datetime.fromisoformat(stamp)
+    assert parsed.tzinfo == timezone.utc
+    assert abs((datetime.now(timezone.utc) - parsed).total_seconds()) < 5
+    assert len(stamp) == len("2026-01-01T00:00:00.000000+00:00")
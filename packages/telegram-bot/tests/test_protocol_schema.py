@@ -96,3 +96,39 @@ class TestProtocolSchema:
                 ("p1", "s1", 1, "A2", "1.0", "hash", 15, 1, 4, "in_progress", 15, now, now, now),
             )
             await db.commit()
+
+    async def test_connection_pragmas_applied(self, db):
+        await apply_protocol_schema(db)
+        cursor = await db.execute("PRAGMA journal_mode")
+        assert (await cursor.fetchone())[0] == "wal"
+        cursor = await db.execute("PRAGMA synchronous")
+        assert (await cursor.fetchone())[0] == 1  # NORMAL
+
+    async def test_processed_events_is_without_rowid(self, db):
+        await apply_protocol_schema(db)
+        with pytest.raises(Exception):  # no rowid column
+            await db.execute("SELECT rowid FROM processed_events")
+
+    async def test_failed_schema_script_rolls_back(self, db):
+        from wellness_bot.protocol.schema import apply_schema_script
+
+        with pytest.raises(Exception):
+            await apply_schema_script(db, "CREATE TABLE t1 (x); CREATE TABLE broken (")
+        assert not db.in_transaction
+        cursor = await db.execute("SELECT name FROM sqlite_master WHERE name = 't1'")
+        assert await cursor.fetchone() is None
+
+    async def test_optional_enum_columns_accept_null(self, db):
+        await apply_protocol_schema(db)
+        now = "2026-02-19T00:00:00Z"
+        await db.execute(
+            """INSERT INTO dialogue_sessions
+               (id, user_id, session_type, current_state, started_at,
+                last_user_activity_at, resumable, end_reason, created_at, updated_at)
+               VALUES (?, ?, ?, ?, ?, ?, 0, NULL, ?, ?)""",
+            ("s1", 1, "new_user", "INTAKE", now, now, now, now),
+        )
+        cursor = await db.execute("SELECT end_reason FROM dialogue_sessions WHERE id = 's1'")
+        assert (await cursor.fetchone())[0] is None
+        with pytest.raises(Exception):  # non-NULL values are still checked
+            await db.execute("UPDATE dialogue_sessions SET end_reason = 'bogus' WHERE id = 's1'")
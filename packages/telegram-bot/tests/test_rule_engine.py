@@ -66,6 +66,16 @@ class TestHardFilter:
         ids = {c["id"] for c in candidates}
         assert ids.issubset({"M3", "U2"})
 
+    def test_repeat_calls_do_not_share_result_list(self, engine):
+        kwargs = dict(
+            distress=3, cycle=MaintainingCycle.WORRY,
+            time_budget=10, readiness=Readiness.ACTION,
+            caution=CautionLevel.NONE,
+        )
+        first = engine.get_eligible(**kwargs)
+        first.clear()
+        assert engine.get_eligible(**kwargs)
+
 
 class TestScoring:
     def test_first_line_scores_higher(self, engine):
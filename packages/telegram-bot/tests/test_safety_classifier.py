@@ -66,6 +66,16 @@ class TestHardRules:
         result = classifier.check_hard_rules("ХОЧУ УМЕРЕТЬ")
         assert result is not None
 
+    def test_list_order_decides_signal_when_several_match(self, classifier):
+        # "суицид" appears first in the text, but the explicit pattern is listed first
+        result = classifier.check_hard_rules("суицид... иногда хочу умереть")
+        assert result.signals == ["suicide_explicit_ru"]
+
+    def test_cached_hits_return_independent_results(self, classifier):
+        first = classifier.check_hard_rules("хочу умереть")
+        first.signals.append("mutated")
+        assert classifier.check_hard_rules("хочу умереть").signals == ["suicide_explicit_ru"]
+
 
 class TestClassify:
     async def test_hard_rules_bypass_llm(self, classifier):
@@ -127,3 +137,31 @@ class TestLLMClassifier:
         result = await classifier_with_llm.classify("что-то случилось", context=[])
         assert result.risk_level == RiskLevel.CAUTION_MILD
         assert result.source == "heuristic"
+
+    async def test_llm_reply_with_invalid_schema_falls_back(self, classifier_with_llm, mock_llm):
+        mock_llm.chat.return_value = MockLLMResponse(
+            content='{"risk_level":"UNKNOWN","signals":"not-a-list","confidence":0.9}',
+        )
+        result = await classifier_with_llm.classify("что-то случилось", context=[])
+        assert result.risk_level == RiskLevel.CAUTION_MILD
+        assert result.signals == ["llm_error"]
+
+    async def test_concurrent_identical_turns_share_one_llm_call(self, classifier_with_llm, mock_llm):
+        import asyncio
+
+        async def slow_reply(**kwargs):
+            await asyncio.sleep(0.01)
+            return MockLLMResponse(
+                content='{"risk_level":"SAFE","signals":[],"confidence":0.9}',
+            )
+
+        mock_llm.chat.side_effect = slow_reply
+        results = await asyncio.gather(
+            classifier_with_llm.classify("ок", context=[]),
+            classifier_with_llm.classify("ок", context=[]),
+        )
+        assert [r.risk_level for r in results] == [RiskLevel.SAFE, RiskLevel.SAFE]
+        assert mock_llm.chat.await_count == 1
+        assert results[0] is not results[1]
+        assert results[0].signals is not results[1].signals
+        assert classifier_with_llm._inflight == {}
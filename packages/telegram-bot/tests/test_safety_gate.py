@@ -249,3 +249,12 @@ class TestMultipleSignals:
         result = gate.check("не вижу смысла жить, хочу покончить с собой")
         assert result.risk_level == "crisis"
         assert result.safety_action == "crisis_protocol"
+
+
+class TestScanCache:
+    """Short messages go through the cached pattern scan."""
+
+    def test_cached_results_are_independent(self, gate: SafetyGate) -> None:
+        first = gate.check("хочу умереть")
+        first.signals.append("mutated")
+        assert gate.check("хочу умереть").signals == ["death_wish_ru"]
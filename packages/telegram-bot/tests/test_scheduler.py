@@ -50,6 +50,7 @@ class TestCheckInScheduler:
         with patch.object(scheduler, "_is_quiet_hour", return_value=False):
             await scheduler._run_checkin(user_id=123)
             scheduler.bot.send_message.assert_called_once()
+            scheduler.store.get_user_state.assert_awaited_once_with(123, fresh=True)
 
     async def test_three_strike_backoff(self, scheduler):
         scheduler.store.get_user_state.return_value["missed_checkins"] = 3
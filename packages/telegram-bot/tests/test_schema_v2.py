@@ -27,7 +27,7 @@ EXPECTED_TABLES = {
     "practice_run_events",
     "practice_outcomes",
     "decision_logs",
-    "safety_events",
+    "coaching_safety_events",
 }
 
 # Table name -> list of required columns
@@ -73,7 +73,7 @@ EXPECTED_COLUMNS = {
         "opportunity_score", "selected_practice_id",
         "latency_ms", "cost", "created_at",
     ],
-    "safety_events": [
+    "coaching_safety_events": [
         "id", "session_id", "detector", "severity",
         "action", "message_hash", "created_at",
     ],
@@ -84,7 +84,7 @@ EXPECTED_INDEXES = {
     "idx_mood_entries_user_created",
     "idx_practice_outcomes_user_practice",
     "idx_decision_logs_session_created",
-    "idx_safety_events_severity_created",
+    "idx_coaching_safety_events_severity_created",
 }
 
 
@@ -249,3 +249,15 @@ class TestSchemaV2Constraints:
                 ("u2", 111),
             )
             await db.commit()
+
+
+class TestSchemaCoexistence:
+    """v1 protocol and v2 coaching schemas can share one database file."""
+
+    async def test_both_schemas_apply_to_same_db(self, db):
+        from wellness_bot.protocol.schema import apply_protocol_schema
+
+        await apply_protocol_schema(db)
+        await apply_coaching_schema(db)
+        cursor = await db.execute("PRAGMA table_info(coaching_safety_events)")
+        assert "severity" in {row[1] for row in await cursor.fetchall()}
@@ -1,8 +1,12 @@
 """Tests for SQLite session store."""
 
+import asyncio
+import sqlite3
+
+import aiosqlite
 import pytest
 
-from wellness_bot.session_store import SessionStore
+from wellness_bot.session_store import _MAX_FLUSH_ATTEMPTS, SessionStore
 
 
 class TestSessionStore:
@@ -66,6 +70,48 @@ class TestSessionStore:
         state = await store.get_user_state(user_id=123)
         assert state["missed_checkins"] == 0
 
+    async def test_partial_update_keeps_other_columns(self, store):
+        await store.update_user_state(user_id=123, status="stable", quiet_start=22)
+        await store.increment_missed_checkins(user_id=123)
+        await store.update_user_state(user_id=123, checkin_interval=6.0)
+        state = await store.get_user_state(user_id=123)
+        assert state == {
+            "status": "stable", "checkin_interval": 6.0, "missed_checkins": 1,
+            "quiet_start": 22, "quiet_end": 8,
+        }
+
+    async def test_user_state_cache_writes_through(self, store):
+        await store.update_user_state(user_id=123, status="stable")
+        state = await store.get_user_state(user_id=123)
+        state["status"] = "mutated by caller"
+        # A write from outside this store stays unseen until the TTL expires
+        db = store._shard(123)
+        await db.execute("UPDATE user_state SET quiet_end = 9 WHERE user_id = 123")
+        await db.commit()
+        await store.increment_missed_checkins(user_id=123)
+        await store.update_user_state(user_id=123, checkin_interval=12.0)
+        state = await store.get_user_state(user_id=123)
+        assert (state["status"], state["missed_checkins"], state["checkin_interval"], state["quiet_end"]) == (
+            "stable", 1, 12.0, 8,
+        )
+        store.state_ttl = 0
+        assert (await store.get_user_state(user_id=123))["quiet_end"] == 9
+
+    async def test_fresh_read_bypasses_cache(self, store):
+        await store.get_user_state(user_id=123)
+        db = store._shard(123)
+        await db.execute("INSERT INTO user_state (user_id, status, updated_at) VALUES (123, 'paused', 0)")
+        await db.commit()
+        assert (await store.get_user_state(user_id=123))["status"] == "onboarding"
+        assert (await store.get_user_state(user_id=123, fresh=True))["status"] == "paused"
+        assert (await store.get_user_state(user_id=123))["status"] == "paused"
+
+    async def test_user_state_cache_is_bounded(self, store):
+        store.state_cache_size = 2
+        for uid in (1, 2, 1, 3):
+            await store.get_user_state(user_id=uid)
+        assert list(store._state_cache) == [1, 3]
+
     async def test_save_and_get_token_usage(self, store):
         await store.save_token_usage(user_id=123, model="claude-sonnet", input_tokens=100, output_tokens=50)
         usage = await store.get_token_usage(days=1)
@@ -79,14 +125,188 @@ class TestSessionStore:
         assert summary["today"]["input_tokens"] == 100
         assert summary["today"]["output_tokens"] == 50
 
+    async def test_logged_token_usage_visible_to_readers(self, store):
+        store.log_token_usage(user_id=123, model="claude-sonnet", input_tokens=100, output_tokens=50)
+        store.log_token_usage(user_id=456, model="claude-sonnet", input_tokens=10, output_tokens=5)
+        summary = await store.get_token_summary()
+        assert summary["today"] == {"input_tokens": 110, "output_tokens": 55}
+
+    async def test_close_flushes_logged_token_usage(self, tmp_path):
+        db_path = str(tmp_path / "flush.db")
+        s = SessionStore(db_path, flush_interval=60.0)
+        await s.init()
+        s.log_token_usage(user_id=1, model="m", input_tokens=7, output_tokens=3)
+        await s.close()
+
+        s = SessionStore(db_path)
+        await s.init()
+        usage = await s.get_token_usage(days=1)
+        await s.close()
+        assert [(u["input_tokens"], u["output_tokens"]) for u in usage] == [(7, 3)]
+
+    async def test_close_flushes_queued_messages_and_moods(self, tmp_path):
+        db_path = str(tmp_path / "batch.db")
+        s = SessionStore(db_path, flush_interval=60.0)
+        await s.init()
+        await s.save_message(user_id=1, role="user", content="Hi")
+        await s.save_mood(user_id=1, score=6)
+        await s.close()
+
+        s = SessionStore(db_path)
+        await s.init()
+        msgs = await s.get_messages(user_id=1)
+        moods = await s.get_moods(user_id=1)
+        await s.close()
+        assert [m["content"] for m in msgs] == ["Hi"]
+        assert [m["score"] for m in moods] == [6]
+
+    @staticmethod
+    def _fail_first_executemany(monkeypatch, db):
+        real = db.executemany
+        failures = []
+
+        async def executemany(sql, rows):
+            if not failures:
+                failures.append(sql)
+                raise sqlite3.OperationalError("disk I/O error")
+            return await real(sql, rows)
+
+        monkeypatch.setattr(db, "executemany", executemany)
+
+    async def test_failed_flush_requeues_rows(self, tmp_path, monkeypatch):
+        s = SessionStore(str(tmp_path / "fail.db"), flush_interval=60.0)
+        await s.init()
+        self._fail_first_executemany(monkeypatch, s._shard(1))
+        await s.save_message(user_id=1, role="user", content="Hi")
+        with pytest.raises(sqlite3.OperationalError):
+            await s.flush()
+        assert [m["content"] for m in await s.get_messages(user_id=1)] == ["Hi"]
+        await s.close()
+
+    async def test_writer_survives_failed_flush(self, tmp_path, monkeypatch):
+        s = SessionStore(str(tmp_path / "fail.db"), flush_interval=0.01)
+        await s.init()
+        db = s._shard(1)
+        self._fail_first_executemany(monkeypatch, db)
+        await s.save_mood(user_id=1, score=4)
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            cursor = await db.execute("SELECT COUNT(*) FROM moods")
+            if (await cursor.fetchone())[0]:
+                break
+        assert not s._writer_task.done()
+        assert s._pending_rows == 0
+        await s.close()
+        assert s._dbs == []
+
+    async def test_rejected_row_dropped_without_losing_batch(self, tmp_path):
+        s = SessionStore(str(tmp_path / "reject.db"), flush_interval=60.0)
+        await s.init()
+        await s.save_message(user_id=1, role="user", content="kept")
+        await s.save_message(user_id=1, role="user", content=None)  # violates NOT NULL
+        await s.save_mood(user_id=1, score=5)
+        await s.flush()
+        assert [m["content"] for m in await s.get_messages(user_id=1)] == ["kept"]
+        assert [m["score"] for m in await s.get_moods(user_id=1)] == [5]
+        await s.close()
+
+    async def test_reads_survive_broken_shard_and_retries_are_capped(self, tmp_path, monkeypatch):
+        s = SessionStore(str(tmp_path / "broken.db"), flush_interval=60.0)
+        await s.init()
+
+        async def broken(sql, rows):
+            raise sqlite3.OperationalError("disk I/O error")
+
+        monkeypatch.setattr(s._shard(1), "executemany", broken)
+        await s.save_message(user_id=1, role="user", content="Hi")
+        for _ in range(_MAX_FLUSH_ATTEMPTS - 1):
+            assert await s.get_messages(user_id=1) == []
+            assert s._pending_rows == 1
+        assert await s.get_messages(user_id=1) == []
+        assert s._pending_rows == 0
+        monkeypatch.undo()
+        await s.close()
+
     async def test_get_all_users(self, store):
         await store.save_message(user_id=111, role="user", content="Hello")
         await store.save_message(user_id=222, role="user", content="Hi")
         users = await store.get_all_users()
         assert len(users) == 2
 
+    async def test_last_message_at_backfilled_on_upgrade(self, tmp_path):
+        db_path = str(tmp_path / "old.db")
+        async with aiosqlite.connect(db_path) as db:
+            await db.executescript("""
+                CREATE TABLE messages (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, role TEXT NOT NULL,
+                                       content TEXT NOT NULL, created_at REAL NOT NULL);
+                CREATE TABLE user_state (user_id INTEGER PRIMARY KEY, status TEXT NOT NULL DEFAULT 'onboarding',
+                                         checkin_interval REAL DEFAULT 4.0, missed_checkins INTEGER DEFAULT 0,
+                                         quiet_start INTEGER DEFAULT 23, quiet_end INTEGER DEFAULT 8,
+                                         updated_at REAL NOT NULL);
+                INSERT INTO messages (user_id, role, content, created_at) VALUES (1, 'user', 'a', 10), (1, 'user', 'b', 30),
+                                                                               (2, 'user', 'c', 20);
+                INSERT INTO user_state (user_id, status, updated_at) VALUES (1, 'stable', 5);
+            """)
+        s = SessionStore(db_path)
+        await s.init()
+        users = await s.get_all_users()
+        await s.close()
+        assert [(u["user_id"], u["status"], u["last_message_at"]) for u in users] == [
+            (1, "stable", 30), (2, "onboarding", 20),
+        ]
+
     async def test_get_recent_messages(self, store):
         await store.save_message(user_id=111, role="user", content="Msg 1")
         await store.save_message(user_id=111, role="assistant", content="Reply 1")
         recent = await store.get_recent_messages(limit=5)
         assert len(recent) == 2
+
+    async def test_connection_uses_wal(self, store):
+        cursor = await store._shard(1).execute("PRAGMA journal_mode")
+        assert (await cursor.fetchone())[0] == "wal"
+        cursor = await store._shard(1).execute("PRAGMA synchronous")
+        assert (await cursor.fetchone())[0] == 1  # NORMAL
+
+
+class TestShardedSessionStore:
+
+    @pytest.fixture
+    async def store(self, tmp_path):
+        s = SessionStore(str(tmp_path / "test.db"), shards=4)
+        await s.init()
+        yield s
+        await s.close()
+
+    async def test_shard_files_created(self, store, tmp_path):
+        assert sorted(p.name for p in tmp_path.glob("*.db")) == [
+            "test_0.db", "test_1.db", "test_2.db", "test_3.db",
+        ]
+
+    async def test_per_user_roundtrip(self, store):
+        await store.save_message(user_id=5, role="user", content="Hi")
+        await store.update_user_state(user_id=5, status="stable")
+        assert [m["content"] for m in await store.get_messages(user_id=5)] == ["Hi"]
+        assert (await store.get_user_state(user_id=5))["status"] == "stable"
+        assert await store.get_messages(user_id=6) == []
+
+    async def test_per_user_read_flushes_only_its_shard(self, store):
+        await store.save_message(user_id=1, role="user", content="one")
+        await store.save_message(user_id=2, role="user", content="two")
+        assert [m["content"] for m in await store.get_messages(user_id=1)] == ["one"]
+        assert store._pending_rows == 1
+        assert [m["content"] for m in await store.get_messages(user_id=2)] == ["two"]
+
+    async def test_global_queries_merge_shards(self, store):
+        for uid in (1, 2, 3):
+            await store.save_message(user_id=uid, role="user", content=f"from {uid}")
+            await store.save_token_usage(user_id=uid, model="m", input_tokens=10, output_tokens=5)
+
+        users = await store.get_all_users()
+        assert [u["user_id"] for u in users] == [3, 2, 1]
+
+        recent = await store.get_recent_messages(limit=2)
+        assert [m["content"] for m in recent] == ["from 3", "from 2"]
+
+        summary = await store.get_token_summary()
+        assert summary["today"] == {"input_tokens": 30, "output_tokens": 15}
+        assert len(await store.get_token_usage(days=1)) == 3
@@ -0,0 +1,19 @@
+"""Tests for the short-text memoization helper."""
+
+from wellness_bot.text_cache import cached_short
+
+
+class TestCachedShort:
+
+    def test_short_text_computed_once(self):
+        calls = []
+        scan = cached_short(lambda text: calls.append(text) or text.upper(), max_len=8)
+        assert scan("ок") == scan("ок") == "ОК"
+        assert calls == ["ок"]
+
+    def test_long_text_bypasses_cache(self):
+        calls = []
+        scan = cached_short(lambda text: calls.append(text) or len(text), max_len=8)
+        long_text = "x" * 9
+        assert scan(long_text) == scan(long_text) == 9
+        assert calls == [long_text, long_text]